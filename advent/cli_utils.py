@@ -1,14 +1,15 @@
 import functools
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable
 
 import click
 
 
-def wrap_main(main: Callable[[Path], str]) -> Callable[[], None]:
+def wrap_main(main: Callable[..., str]) -> Callable[[], None]:
+    # click options declared below @wrap_main are passed on as keyword arguments
     @functools.wraps(main)
-    def main_wrapper(filename: Path) -> None:
-        click.echo(main(filename))
+    def main_wrapper(filename: Path, **kwargs: Any) -> None:
+        click.echo(main(filename, **kwargs))
 
     return click.command()(
         click.argument(
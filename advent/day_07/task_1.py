@@ -1,8 +1,9 @@
-import itertools as it
 import logging
-from collections import Counter
 from pathlib import Path
-from typing import Iterable, NamedTuple, TypeAlias
+from typing import Iterable, NamedTuple, Sequence, TypeAlias
+
+import numpy as np
+from numpy import typing as npt
 
 from ..cli_utils import wrap_main
 from ..io_utils import get_stripped_lines
@@ -11,75 +12,117 @@ from ..logs import setup_logging
 logger = logging.getLogger(__name__)
 
 
-SYMBOL_TO_CARD_VALUE: dict[str, int] = {c: v for v, c in enumerate("AKQJT98765432", 1)}
-CARD_VALUE_TO_SYMBOL: dict[int, str] = {v: k for k, v in SYMBOL_TO_CARD_VALUE.items()}
+SYMBOLS = "23456789TJQKA"
+SYMBOL_TO_INDEX: dict[str, int] = {c: i for i, c in enumerate(SYMBOLS)}
+HAND_SIZE = 5
 
-Cards: TypeAlias = list[int]
+Cards: TypeAlias = npt.NDArray[np.uint8]
 
 
-class Hand(NamedTuple):
+class Hands(NamedTuple):
+    # (n, HAND_SIZE) indices into SYMBOLS
     cards: Cards
-    bid: int
-
-    def __repr__(self) -> str:
-        return "".join(map(CARD_VALUE_TO_SYMBOL.__getitem__, self.cards))
-
-
-HandType: TypeAlias = dict[int, int]
-
-HAND_TYPE_VALUES: list[tuple[HandType, int]] = [
-    (card_type, value)
-    for value, card_type in enumerate(
-        [
-            {5: 1},
-            {4: 1, 1: 1},
-            {3: 1, 2: 1},
-            {3: 1, 1: 2},
-            {2: 2, 1: 1},
-            {2: 1, 1: 3},
-            {1: 5},
-        ],
-        1,
-    )
-]
+    # (n,) bids
+    bids: npt.NDArray[np.int64]
 
 
-def get_hand_type(cards: Cards) -> HandType:
-    # hand = [1, 1, 2, 3, 2]
-    card_counter = Counter(cards)
-    # card_counter = {1: 2, 2: 2, 3: 1}
-    counts_counter = Counter(card_counter.values())
-    # counts_counter = {2: 2, 1: 1}
-    return counts_counter
+class Rules(NamedTuple):
+    # card symbols from the strongest to the weakest
+    card_order: str
+    # symbols that pretend to be whatever card makes the hand type strongest
+    wildcards: frozenset[str] = frozenset()
 
 
-def get_hand_type_value(hand_type: HandType) -> int:
-    for possible_type, value in HAND_TYPE_VALUES:
-        if possible_type == hand_type:
-            return value
-    raise AssertionError(f"Unrecognized hand type: {hand_type!r}")
+STANDARD_RULES = Rules(card_order="AKQJT98765432")
 
+# Hand type values indexed by (highest count, second highest count).
+# Counts never exceed the hand size, so a dense lookup table is enough.
+HAND_TYPE_VALUES = np.zeros((HAND_SIZE + 1, HAND_SIZE + 1), dtype=np.int64)
+HAND_TYPE_VALUES[5, 0] = 6  # five of a kind
+HAND_TYPE_VALUES[4, 1] = 5  # four of a kind
+HAND_TYPE_VALUES[3, 2] = 4  # full house
+HAND_TYPE_VALUES[3, 1] = 3  # three of a kind
+HAND_TYPE_VALUES[2, 2] = 2  # two pair
+HAND_TYPE_VALUES[2, 1] = 1  # one pair
+# high card stays 0
 
-def parse_hands(lines: Iterable[str]) -> Iterable[Hand]:
+
+def parse_hands(lines: Iterable[str]) -> Hands:
+    cards: list[list[int]] = []
+    bids: list[int] = []
     for line in lines:
         cards_raw, bid_raw = line.split()
-        cards = [SYMBOL_TO_CARD_VALUE[c] for c in cards_raw]
-        bid = int(bid_raw)
-        yield Hand(cards=cards, bid=bid)
+        cards.append([SYMBOL_TO_INDEX[c] for c in cards_raw])
+        bids.append(int(bid_raw))
+    return Hands(
+        cards=np.array(cards, dtype=np.uint8).reshape(-1, HAND_SIZE),
+        bids=np.array(bids, dtype=np.int64),
+    )
 
 
-def get_hand_score(hand: Hand) -> tuple[int, ...]:
-    return get_hand_type_value(get_hand_type(hand.cards)), *hand.cards
+def get_symbol_counts(cards: Cards) -> npt.NDArray[np.int64]:
+    # (n, len(SYMBOLS)) number of occurrences of every symbol in every hand
+    counts = np.zeros((len(cards), len(SYMBOLS)), dtype=np.int64)
+    rows = np.repeat(np.arange(len(cards)), HAND_SIZE)
+    np.add.at(counts, (rows, cards.ravel()), 1)
+    return counts
+
+
+def get_hand_type_values(
+    counts: npt.NDArray[np.int64], rules: Rules
+) -> npt.NDArray[np.int64]:
+    wildcard_mask = np.array([c in rules.wildcards for c in SYMBOLS], dtype=np.bool_)
+    number_of_wildcards = counts[:, wildcard_mask].sum(axis=1)
+    regular_counts = np.where(wildcard_mask, 0, counts)
+    # two highest counts of regular cards per hand
+    top_two = -np.partition(-regular_counts, 1, axis=1)[:, :2]
+    # wildcards always join the most common card
+    highest = top_two[:, 0] + number_of_wildcards
+    second_highest = top_two[:, 1]
+    hand_type_values: npt.NDArray[np.int64] = HAND_TYPE_VALUES[highest, second_highest]
+    return hand_type_values
+
+
+def get_card_strengths(rules: Rules) -> npt.NDArray[np.int64]:
+    # strength of every symbol in SYMBOLS order, the weakest card is 0
+    assert sorted(rules.card_order) == sorted(SYMBOLS), rules.card_order
+    strengths = np.zeros(len(SYMBOLS), dtype=np.int64)
+    for strength, symbol in enumerate(reversed(rules.card_order)):
+        strengths[SYMBOL_TO_INDEX[symbol]] = strength
+    return strengths
+
+
+def get_hand_scores(
+    hands: Hands, counts: npt.NDArray[np.int64], rules: Rules
+) -> npt.NDArray[np.int64]:
+    # a single sortable number: hand type first, then cards in positional order
+    base = len(SYMBOLS)
+    scores = get_hand_type_values(counts, rules)
+    strengths = get_card_strengths(rules)[hands.cards]
+    for position in range(HAND_SIZE):
+        scores = scores * base + strengths[:, position]
+    return scores
+
+
+def get_winnings(hands: Hands, variants: Sequence[Rules]) -> list[int]:
+    counts = get_symbol_counts(hands.cards)
+    ranks = np.arange(1, len(hands.bids) + 1, dtype=np.int64)
+    winnings: list[int] = []
+    for rules in variants:
+        scores = get_hand_scores(hands, counts, rules)
+        order = np.argsort(scores, kind="stable")
+        total: int = (hands.bids[order] * ranks).sum().item()
+        logger.debug("Winnings under %s: %d", rules, total)
+        winnings.append(total)
+    return winnings
 
 
 @wrap_main
 def main(filename: Path) -> str:
     lines = get_stripped_lines(filename)
     hands = parse_hands(lines)
-    sorted_hands = sorted(hands, key=get_hand_score, reverse=True)
-    hands_with_ranks = enumerate(sorted_hands, 1)
-    winnings = it.starmap(lambda rank, hand: rank * hand.bid, hands_with_ranks)
-    return str(sum(winnings))
+    (winnings,) = get_winnings(hands, [STANDARD_RULES])
+    return str(winnings)
 
 
 if __name__ == "__main__":
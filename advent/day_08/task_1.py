@@ -1,8 +1,10 @@
-import itertools as it
 import logging
 import re
 from pathlib import Path
-from typing import Iterator, Literal, TypeAlias
+from typing import Iterator, Literal, NamedTuple, TypeAlias
+
+import numpy as np
+from numpy import typing as npt
 
 from ..cli_utils import wrap_main
 from ..io_utils import get_stripped_lines
@@ -36,29 +38,123 @@ def parse_map(lines: Iterator[str]) -> dict[Node, tuple[Node, Node]]:
     return result
 
 
-def traverse_map(
-    map: dict[Node, tuple[Node, Node]],
+class CompiledMap(NamedTuple):
+    names: list[Node]
+    ids: dict[Node, int]
+    # (n, 2) left and right successor id of every node
+    successors: npt.NDArray[np.int32]
+
+
+def compile_map(map: dict[Node, tuple[Node, Node]]) -> CompiledMap:
+    names = list(map)
+    ids = {node: i for i, node in enumerate(names)}
+    successors = np.array(
+        [[ids[left], ids[right]] for left, right in map.values()], dtype=np.int32
+    ).reshape(-1, 2)
+    return CompiledMap(names=names, ids=ids, successors=successors)
+
+
+NO_END = -1
+# enough levels to jump over any number of passes that fits in int64
+MAX_LEVELS = 63
+
+
+class EndNotReachable(Exception):
+    pass
+
+
+class JumpTable(NamedTuple):
+    successors: npt.NDArray[np.int32]
+    is_end: npt.NDArray[np.bool_]
+    instructions: npt.NDArray[np.uint8]
+    # (n,) step of a single pass (1-based) on which an end node is first hit
+    first_end: npt.NDArray[np.int64]
+    # (levels, n) node reached after 2**level full passes over the instructions
+    landings: npt.NDArray[np.int32]
+    # (levels, n) whether an end node is hit during those 2**level passes
+    hits_end: npt.NDArray[np.bool_]
+
+    @property
+    def pass_length(self) -> int:
+        return len(self.instructions)
+
+
+def build_jump_table(
+    compiled: CompiledMap,
     instructions: list[Direction],
     *,
-    start: Node,
-    ends: set[Node]
-) -> int:
-    steps = 0
+    ends: set[Node],
+    levels: int = MAX_LEVELS,
+) -> JumpTable:
+    number_of_nodes = len(compiled.names)
+    is_end = np.zeros(number_of_nodes, dtype=np.bool_)
+    is_end[[compiled.ids[end] for end in ends if end in compiled.ids]] = True
+
+    # walk a whole pass from every node at once
+    positions = np.arange(number_of_nodes, dtype=np.int32)
+    first_end = np.full(number_of_nodes, NO_END, dtype=np.int64)
+    for step, direction in enumerate(instructions, 1):
+        positions = compiled.successors[positions, direction]
+        first_end[is_end[positions] & (first_end == NO_END)] = step
+
+    landings = np.empty((levels, number_of_nodes), dtype=np.int32)
+    hits_end = np.empty((levels, number_of_nodes), dtype=np.bool_)
+    landings[0] = positions
+    hits_end[0] = first_end != NO_END
+    for level in range(1, levels):
+        previous = landings[level - 1]
+        landings[level] = previous[previous]
+        hits_end[level] = hits_end[level - 1] | hits_end[level - 1][previous]
+
+    return JumpTable(
+        successors=compiled.successors,
+        is_end=is_end,
+        instructions=np.array(instructions, dtype=np.uint8),
+        first_end=first_end,
+        landings=landings,
+        hits_end=hits_end,
+    )
+
+
+def steps_until_end(table: JumpTable, start: int) -> int:
+    # skip the longest run of passes that never touches an end node
+    levels, _ = table.landings.shape
+    node = start
+    passes = 0
+    for level in reversed(range(levels)):
+        if not table.hits_end[level, node]:
+            node = table.landings[level, node]
+            passes += 1 << level
+    first_end = int(table.first_end[node])
+    if first_end == NO_END:
+        raise EndNotReachable(f"No end node reachable from node {start}")
+    return passes * table.pass_length + first_end
+
+
+def position_after(table: JumpTable, start: int, steps: int) -> int:
+    levels, _ = table.landings.shape
+    passes, remainder = divmod(steps, table.pass_length)
+    if passes >> levels:
+        raise ValueError(f"Cannot jump over {passes} passes with {levels} levels")
     node = start
-    for direction in it.cycle(instructions):
-        node = map[node][direction]
-        steps += 1
-        if node in ends:
-            break
-    return steps
+    level = 0
+    while passes:
+        if passes & 1:
+            node = table.landings[level, node]
+        passes >>= 1
+        level += 1
+    for direction in table.instructions[:remainder]:
+        node = table.successors[node, direction]
+    return int(node)
 
 
 @wrap_main
 def main(filename: Path) -> str:
     lines = iter(get_stripped_lines(filename))
     instructions = parse_instructions(lines)
-    map = parse_map(lines)
-    steps = traverse_map(map, instructions, start="AAA", ends={"ZZZ"})
+    compiled = compile_map(parse_map(lines))
+    table = build_jump_table(compiled, instructions, ends={"ZZZ"})
+    steps = steps_until_end(table, compiled.ids["AAA"])
     return str(steps)
 
 
@@ -1,39 +1,153 @@
-import itertools as it
+import functools
 import logging
 import math
-import operator
-from functools import reduce
+import multiprocessing as mp
 from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
 
 from ..cli_utils import wrap_main
 from ..io_utils import get_stripped_lines
 from ..logs import setup_logging
-from .task_1 import Direction, Node, parse_instructions, parse_map, traverse_map
+from .task_1 import (
+    EndNotReachable,
+    JumpTable,
+    build_jump_table,
+    compile_map,
+    parse_instructions,
+    parse_map,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def find_lcm(num1, num2):
-    return (num1 * num2) // math.gcd(num1, num2)
+class HitPattern(NamedTuple):
+    # steps on which an end node is hit before the walk enters its cycle
+    prefix: list[int]
+    # steps of the first lap of the cycle on which an end node is hit,
+    # each of them repeats every `period` steps
+    offsets: list[int]
+    period: int
+
+
+class Progression(NamedTuple):
+    # first element and the distance between consecutive elements
+    first: int
+    period: int
+
+
+def get_hit_pattern(table: JumpTable, start: int) -> HitPattern:
+    # The walk state is (node, instruction index). It is periodic with
+    # a multiple of the instruction length, so it is enough to look for
+    # a repeating node at the start of a pass.
+    first_seen: dict[int, int] = {}
+    pass_starts: list[int] = []
+    node = start
+    while node not in first_seen:
+        first_seen[node] = len(pass_starts)
+        pass_starts.append(node)
+        node = int(table.landings[0, node])
+    cycle_start = first_seen[node]
+    pass_length = table.pass_length
+
+    # walk every distinct pass of the trajectory in lock-step
+    positions = np.array(pass_starts, dtype=np.int32)
+    hits = np.empty((pass_length, len(pass_starts)), dtype=np.bool_)
+    for step, direction in enumerate(table.instructions):
+        positions = table.successors[positions, direction]
+        hits[step] = table.is_end[positions]
+    steps_in_pass, pass_indices = np.nonzero(hits)
+    steps = sorted((pass_indices * pass_length + steps_in_pass + 1).tolist())
+
+    boundary = cycle_start * pass_length
+    pattern = HitPattern(
+        prefix=[step for step in steps if step <= boundary],
+        offsets=[step for step in steps if step > boundary],
+        period=(len(pass_starts) - cycle_start) * pass_length,
+    )
+    logger.debug(
+        "Start %d: %d pre-cycle hits, %d hits per cycle of %d steps",
+        start,
+        len(pattern.prefix),
+        len(pattern.offsets),
+        pattern.period,
+    )
+    return pattern
+
+
+def get_hit_patterns(
+    table: JumpTable, starts: list[int], processes: Optional[int] = None
+) -> list[HitPattern]:
+    processes = processes or mp.cpu_count()
+    chunksize = math.ceil(len(starts) / processes) or 1
+    with mp.Pool(processes) as pool:
+        return pool.map(
+            functools.partial(get_hit_pattern, table), starts, chunksize=chunksize
+        )
+
+
+def is_hit(pattern: HitPattern, step: int) -> bool:
+    return step in pattern.prefix or any(
+        step >= offset and (step - offset) % pattern.period == 0
+        for offset in pattern.offsets
+    )
+
+
+def combine(a: Progression, b: Progression) -> Optional[Progression]:
+    # generalised chinese remainder theorem for non-coprime periods
+    gcd = math.gcd(a.period, b.period)
+    difference = b.first - a.first
+    if difference % gcd:
+        return None
+    period = a.period // gcd * b.period
+    modulus = b.period // gcd
+    multiplier = (difference // gcd * pow(a.period // gcd, -1, modulus)) % modulus
+    first = (a.first + a.period * multiplier) % period
+    # both progressions only start at their first element
+    lowest = max(a.first, b.first)
+    if first < lowest:
+        first += (lowest - first + period - 1) // period * period
+    return Progression(first, period)
+
+
+def find_earliest_common_step(patterns: list[HitPattern]) -> int:
+    candidates: list[int] = []
+
+    # steps hit before some ghost enters its cycle
+    for pattern in patterns:
+        for step in pattern.prefix:
+            if all(is_hit(other, step) for other in patterns):
+                candidates.append(step)
+                break
 
+    # steps where every ghost is inside its cycle
+    progressions = [Progression(0, 1)]
+    for pattern in patterns:
+        progressions = [
+            combined
+            for progression in progressions
+            for offset in pattern.offsets
+            if (combined := combine(progression, Progression(offset, pattern.period)))
+            is not None
+        ]
+    candidates.extend(progression.first for progression in progressions)
 
-def find_lcm_list(numbers):
-    return reduce(find_lcm, numbers)
+    if not candidates:
+        raise EndNotReachable("Ghosts never stand on end nodes at the same time")
+    return min(candidates)
 
 
 @wrap_main
 def main(filename: Path) -> str:
     lines = iter(get_stripped_lines(filename))
     instructions = parse_instructions(lines)
-    map = parse_map(lines)
-    ending_nodes = {node for node in map if node.endswith("Z")}
-    starting_nodes = [node for node in map if node.endswith("A")]
-    steps_per_node = [
-        traverse_map(map, instructions, start=node, ends=ending_nodes)
-        for node in starting_nodes
-    ]
-    common_denominator = find_lcm_list(steps_per_node)
-    return str(common_denominator)
+    compiled = compile_map(parse_map(lines))
+    ending_nodes = {node for node in compiled.names if node.endswith("Z")}
+    starting_nodes = [node for node in compiled.names if node.endswith("A")]
+    table = build_jump_table(compiled, instructions, ends=ending_nodes)
+    patterns = get_hit_patterns(table, [compiled.ids[node] for node in starting_nodes])
+    return str(find_earliest_common_step(patterns))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+import pytest
+
+from .task_1 import (
+    CompiledMap,
+    EndNotReachable,
+    JumpTable,
+    build_jump_table,
+    compile_map,
+    parse_instructions,
+    parse_map,
+    position_after,
+    steps_until_end,
+)
+
+SAMPLE = """\
+LLR
+
+AAA = (BBB, BBB)
+BBB = (AAA, ZZZ)
+ZZZ = (ZZZ, ZZZ)"""
+
+GHOST_SAMPLE = """\
+LR
+
+11A = (11B, XXX)
+11B = (XXX, 11Z)
+11Z = (11B, XXX)
+22A = (22B, XXX)
+22B = (22C, 22C)
+22C = (22Z, 22Z)
+22Z = (22B, 22B)
+XXX = (XXX, XXX)"""
+
+# the end node is only hit on the second step of the 13th pass
+LONG_SAMPLE = "\n".join(
+    [
+        "RLR",
+        "",
+        *(f"A{i:02} = (Q{i:02}, A{i + 1:02})" for i in range(12)),
+        *(f"Q{i:02} = (A{i:02}, Q{i:02})" for i in range(12)),
+        "A12 = (ZZZ, A12)",
+        "ZZZ = (A00, ZZZ)",
+    ]
+)
+
+
+def compile_sample(text: str, ends: set[str]) -> tuple[CompiledMap, JumpTable]:
+    lines = iter(text.splitlines())
+    instructions = parse_instructions(lines)
+    compiled = compile_map(parse_map(lines))
+    return compiled, build_jump_table(compiled, instructions, ends=ends)
+
+
+def walk(table: JumpTable, start: int, steps: int) -> int:
+    node = start
+    for step in range(steps):
+        direction = table.instructions[step % table.pass_length]
+        node = table.successors[node, direction]
+    return int(node)
+
+
+def walk_until_end(table: JumpTable, start: int) -> int:
+    node, steps = start, 0
+    while True:
+        node = table.successors[node, table.instructions[steps % table.pass_length]]
+        steps += 1
+        if table.is_end[node]:
+            return steps
+
+
+@pytest.mark.parametrize(
+    "text,ends",
+    [
+        (SAMPLE, {"ZZZ"}),
+        (GHOST_SAMPLE, {"11Z", "22Z"}),
+        (LONG_SAMPLE, {"ZZZ"}),
+    ],
+)
+def test_position_after(text: str, ends: set[str]) -> None:
+    compiled, table = compile_sample(text, ends)
+    # covers several levels of the table, with and without a partial pass
+    for start in range(len(compiled.names)):
+        for steps in range(0, 20 * table.pass_length + 2):
+            assert position_after(table, start, steps) == walk(table, start, steps)
+
+
+def test_steps_until_end() -> None:
+    compiled, table = compile_sample(LONG_SAMPLE, {"ZZZ"})
+    start = compiled.ids["A00"]
+    assert steps_until_end(table, start) == walk_until_end(table, start) == 38
+    for node in compiled.ids.values():
+        assert steps_until_end(table, node) == walk_until_end(table, node)
+    compiled, table = compile_sample(SAMPLE, {"ZZZ"})
+    assert steps_until_end(table, compiled.ids["AAA"]) == 6
+
+
+def test_steps_until_end_unreachable() -> None:
+    compiled, table = compile_sample(GHOST_SAMPLE, {"11Z"})
+    with pytest.raises(EndNotReachable):
+        steps_until_end(table, compiled.ids["22A"])
@@ -0,0 +1,75 @@
+from typing import Optional
+
+import pytest
+
+from .task_1 import EndNotReachable
+from .task_2 import HitPattern, Progression, combine, find_earliest_common_step
+
+COMBINE_TEST_CASES: list[tuple[Progression, Progression, Optional[Progression]]] = [
+    # coprime periods
+    (Progression(2, 3), Progression(3, 5), Progression(8, 15)),
+    # shared factor, consistent residues
+    (Progression(2, 4), Progression(4, 6), Progression(10, 12)),
+    # shared factor, inconsistent residues
+    (Progression(1, 4), Progression(2, 6), None),
+    # solution below both starts is lifted above them
+    (Progression(10, 2), Progression(21, 3), Progression(24, 6)),
+]
+
+
+@pytest.mark.parametrize("a,b,expected", COMBINE_TEST_CASES)
+def test_combine(
+    a: Progression, b: Progression, expected: Optional[Progression]
+) -> None:
+    assert combine(a, b) == expected
+
+
+FIND_TEST_CASES: list[tuple[list[HitPattern], int]] = [
+    # clean periods starting at 0 (plain LCM)
+    (
+        [
+            HitPattern(prefix=[], offsets=[2], period=2),
+            HitPattern(prefix=[], offsets=[3], period=3),
+        ],
+        6,
+    ),
+    # non-zero offsets
+    (
+        [
+            HitPattern(prefix=[], offsets=[5], period=4),
+            HitPattern(prefix=[], offsets=[3], period=6),
+        ],
+        9,
+    ),
+    # several hits per cycle
+    (
+        [
+            HitPattern(prefix=[], offsets=[3, 4], period=10),
+            HitPattern(prefix=[], offsets=[14], period=20),
+        ],
+        14,
+    ),
+    # hit before entering the cycle
+    (
+        [
+            HitPattern(prefix=[1], offsets=[7], period=7),
+            HitPattern(prefix=[], offsets=[1], period=1),
+        ],
+        1,
+    ),
+]
+
+
+@pytest.mark.parametrize("patterns,expected", FIND_TEST_CASES)
+def test_find_earliest_common_step(patterns: list[HitPattern], expected: int) -> None:
+    assert find_earliest_common_step(patterns) == expected
+
+
+def test_find_earliest_common_step_unreachable() -> None:
+    with pytest.raises(EndNotReachable):
+        find_earliest_common_step(
+            [
+                HitPattern(prefix=[], offsets=[1], period=2),
+                HitPattern(prefix=[], offsets=[2], period=2),
+            ]
+        )
@@ -0,0 +1,81 @@
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+from ..cli_utils import wrap_main
+from ..io_utils import get_stripped_lines
+from ..logs import setup_logging
+from .task_1 import NEXT, PREVIOUS, History, extrapolate, parse_history
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 4096
+
+
+class RunningSums(NamedTuple):
+    rows: int
+    next_sum: int
+    previous_sum: int
+
+
+def stream_extrapolations(
+    histories: Iterable[History],
+    *,
+    batch_size: int = BATCH_SIZE,
+    max_pending: int = 8 * BATCH_SIZE,
+) -> Iterator[RunningSums]:
+    # Rows are buffered per length, because only equal-length histories share
+    # coefficients. A bucket is flushed once it holds batch_size rows and the
+    # biggest one is flushed once max_pending rows are buffered in total, so
+    # memory does not depend on the length of the stream.
+    pending: dict[int, list[History]] = defaultdict(list)
+    number_of_pending = 0
+    sums = RunningSums(rows=0, next_sum=0, previous_sum=0)
+
+    def flush(length: int) -> RunningSums:
+        nonlocal number_of_pending
+        batch = pending.pop(length)
+        number_of_pending -= len(batch)
+        extrapolations = extrapolate(np.stack(batch))
+        return RunningSums(
+            rows=sums.rows + len(batch),
+            next_sum=sums.next_sum + int(extrapolations[:, NEXT].sum()),
+            previous_sum=sums.previous_sum + int(extrapolations[:, PREVIOUS].sum()),
+        )
+
+    for history in histories:
+        length = len(history)
+        pending[length].append(history)
+        number_of_pending += 1
+        if len(pending[length]) >= batch_size:
+            sums = flush(length)
+            yield sums
+        elif number_of_pending >= max_pending:
+            sums = flush(max(pending, key=lambda length: len(pending[length])))
+            yield sums
+    while pending:
+        sums = flush(next(iter(pending)))
+        yield sums
+
+
+@wrap_main
+def main(filename: Path) -> str:
+    lines = get_stripped_lines(filename)
+    histories = map(parse_history, lines)
+    sums = RunningSums(rows=0, next_sum=0, previous_sum=0)
+    for sums in stream_extrapolations(histories):
+        logger.info(
+            "After %d rows: next sum %d, previous sum %d",
+            sums.rows,
+            sums.next_sum,
+            sums.previous_sum,
+        )
+    return f"{sums.next_sum} {sums.previous_sum}"
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -1,6 +1,9 @@
+import functools
 import logging
+import math
+from collections import defaultdict
 from pathlib import Path
-from typing import TypeAlias
+from typing import Any, Iterable, TypeAlias
 
 import numpy as np
 from numpy import typing as npt
@@ -12,32 +15,70 @@ from ..logs import setup_logging
 logger = logging.getLogger(__name__)
 
 History: TypeAlias = npt.NDArray[np.int64]
+# (rows, length) histories of equal length
+Histories: TypeAlias = npt.NDArray[np.int64]
+# (rows, 2) next and previous value of every history, int64 or exact python ints
+Extrapolations: TypeAlias = npt.NDArray[Any]
+
+NEXT = 0
+PREVIOUS = 1
+
+INT64_MAX = np.iinfo(np.int64).max
 
 
 def parse_history(line: str) -> History:
     return np.array(list(map(int, line.split())), dtype=np.int64)
 
 
-def find_next_element(history: History) -> int:
-    last_elements: list[int] = [history[-1]]
-    logger.debug("Finding next element for history: %s", history)
-    seq = history
-    while np.count_nonzero(seq) > 1:
-        seq = np.diff(seq)
-        last_elements.append(seq[-1])
-        logger.debug("seq: %s", seq)
-    logger.debug("last_elements: %s", last_elements)
-    result: int = np.sum(last_elements)
-    logger.info("result: %s", result)
-    return result
+def parse_histories(lines: Iterable[str]) -> list[Histories]:
+    # one matrix per length, only equal-length histories share coefficients
+    by_length: dict[int, list[History]] = defaultdict(list)
+    for line in lines:
+        history = parse_history(line)
+        by_length[len(history)].append(history)
+    return [np.stack(rows) for rows in by_length.values()]
+
+
+@functools.cache
+def get_coefficients(length: int) -> list[tuple[int, int]]:
+    # Taking differences until they are all zero is equivalent to fitting
+    # a polynomial of degree < length through the points 0..length-1.
+    # Its Lagrange form evaluated at x=length and x=-1 reduces to signed
+    # binomial coefficients, so both extrapolations are dot products.
+    return [
+        (
+            (-1) ** (length - 1 - i) * math.comb(length, i),
+            (-1) ** i * math.comb(length, i + 1),
+        )
+        for i in range(length)
+    ]
+
+
+def extrapolate(histories: Histories) -> Extrapolations:
+    _, length = histories.shape
+    coefficients = get_coefficients(length)
+    largest_value = max(
+        abs(int(histories.max(initial=0))), abs(int(histories.min(initial=0)))
+    )
+    largest_weight = max(sum(abs(c) for c in column) for column in zip(*coefficients))
+    # the coefficients themselves must fit as well, even for all-zero rows
+    if largest_weight <= INT64_MAX and largest_value * largest_weight <= INT64_MAX:
+        return histories @ np.array(coefficients, dtype=np.int64)
+    logger.info("Histories of length %d may overflow int64, using exact ints", length)
+    exact: Extrapolations = histories.astype(object) @ np.array(
+        coefficients, dtype=object
+    )
+    return exact
 
 
 @wrap_main
 def main(filename: Path) -> str:
     lines = get_stripped_lines(filename)
-    histories = map(parse_history, lines)
-    next_elements = map(find_next_element, histories)
-    return str(sum(next_elements))
+    total = sum(
+        int(extrapolate(histories)[:, NEXT].sum())
+        for histories in parse_histories(lines)
+    )
+    return str(total)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+import numpy as np
+
+from .streaming import RunningSums, stream_extrapolations
+from .task_1 import parse_history
+
+LINES = [
+    "0 3 6 9 12 15",
+    "1 3 6 10 15 21",
+    "10 13 16 21 30 45",
+    "5 5 5",
+    "1 4 9 16",
+    "2",
+]
+
+
+def test_stream_extrapolations() -> None:
+    histories = map(parse_history, LINES)
+    sums = list(stream_extrapolations(histories, batch_size=2, max_pending=3))
+    assert [s.rows for s in sums] == sorted(s.rows for s in sums)
+    assert sums[-1] == RunningSums(rows=6, next_sum=114 + 5 + 25 + 2, previous_sum=9)
+
+
+def test_stream_extrapolations_large_values() -> None:
+    history = np.arange(1, 41, dtype=np.int64) * 10**15
+    (sums,) = stream_extrapolations([history])
+    assert sums == RunningSums(rows=1, next_sum=41 * 10**15, previous_sum=0)
@@ -0,0 +1,13 @@
+from .task_1 import NEXT, PREVIOUS, extrapolate, parse_histories
+
+
+def test_histories_of_different_lengths() -> None:
+    groups = parse_histories(["0 3 6 9 12 15", "1 3 6 10 15", "2 4 6 8 10 12"])
+    assert sorted(len(histories) for histories in groups) == [1, 2]
+    assert sum(int(extrapolate(h)[:, NEXT].sum()) for h in groups) == 18 + 21 + 14
+    assert sum(int(extrapolate(h)[:, PREVIOUS].sum()) for h in groups) == -3 + 0 + 0
+
+
+def test_long_zero_histories() -> None:
+    (histories,) = parse_histories([" ".join(["0"] * 70)] * 2)
+    assert extrapolate(histories).tolist() == [[0, 0], [0, 0]]
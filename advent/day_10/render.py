@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Iterator
+
+import click
+import numpy as np
+import numpy.typing as npt
+
+from ..io_utils import parse_board, write_grayscale_rows
+from ..logs import setup_logging
+from .task_1 import CELLS, CHAR_MAP, Cell, Grid, Loop, trace_loop
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 3
+
+CELL_TO_TILE: dict[Cell, npt.NDArray[np.uint8]] = {
+    Cell.EMPTY: np.array(
+        [
+            [0, 0, 0],
+            [0, 0, 0],
+            [0, 0, 0],
+        ],
+        dtype=np.uint8,
+    ),
+    Cell.START: np.array(
+        [
+            [0, 1, 0],
+            [1, 1, 1],
+            [0, 1, 0],
+        ],
+        dtype=np.uint8,
+    ),
+    Cell.NORTH_SOUTH: np.array(
+        [
+            [0, 1, 0],
+            [0, 1, 0],
+            [0, 1, 0],
+        ],
+        dtype=np.uint8,
+    ),
+    Cell.EAST_WEST: np.array(
+        [
+            [0, 0, 0],
+            [1, 1, 1],
+            [0, 0, 0],
+        ],
+        dtype=np.uint8,
+    ),
+    Cell.NORTH_EAST: np.array(
+        [
+            [0, 1, 0],
+            [0, 1, 1],
+            [0, 0, 0],
+        ],
+        dtype=np.uint8,
+    ),
+    Cell.NORTH_WEST: np.array(
+        [
+            [0, 1, 0],
+            [1, 1, 0],
+            [0, 0, 0],
+        ],
+        dtype=np.uint8,
+    ),
+    Cell.SOUTH_EAST: np.array(
+        [
+            [0, 0, 0],
+            [0, 1, 1],
+            [0, 1, 0],
+        ],
+        dtype=np.uint8,
+    ),
+    Cell.SOUTH_WEST: np.array(
+        [
+            [0, 0, 0],
+            [1, 1, 0],
+            [0, 1, 0],
+        ],
+        dtype=np.uint8,
+    ),
+}
+
+
+# (number of cell types, TILE_SIZE, TILE_SIZE) indexed by the grid cell codes,
+# already scaled to image intensities
+TILE_ATLAS = np.stack([CELL_TO_TILE[cell] for cell in CELLS]) * np.uint8(255)
+# grid rows drawn at a time, so a huge map never exists as a whole image
+BLOCK_ROWS = 256
+
+
+def draw_loop(
+    grid: Grid, loop: Loop, block_rows: int = BLOCK_ROWS
+) -> Iterator[npt.NDArray[np.uint8]]:
+    # yields consecutive (rows * TILE_SIZE, width * TILE_SIZE) blocks of the image
+    height, width = grid.shape
+    # cells that are not part of the loop are drawn as empty
+    tile_indices = np.zeros_like(grid)
+    tile_indices.flat[loop] = grid.flat[loop]
+    for first in range(0, height, block_rows):
+        # (rows, width, TILE_SIZE, TILE_SIZE) -> (rows * TILE_SIZE, width * TILE_SIZE)
+        tiles = TILE_ATLAS[tile_indices[first : first + block_rows]]
+        rows = len(tiles)
+        yield tiles.transpose(0, 2, 1, 3).reshape(rows * TILE_SIZE, width * TILE_SIZE)
+
+
+@click.command()
+@click.argument(
+    "filename",
+    type=click.Path(
+        exists=True, file_okay=True, dir_okay=False, readable=True, path_type=Path
+    ),
+)
+@click.argument(
+    "output",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=Path),
+)
+def main(filename: Path, output: Path) -> None:
+    grid = parse_board(filename, CHAR_MAP)
+    loop = trace_loop(grid)
+    height, width = grid.shape
+    image_height, image_width = height * TILE_SIZE, width * TILE_SIZE
+    logger.debug("Writing %dx%d image to %s", image_width, image_height, output)
+    write_grayscale_rows(output, image_width, image_height, draw_loop(grid, loop))
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -0,0 +1,11 @@
+from pathlib import Path
+
+from ..io_utils import parse_board
+from .task_1 import CHAR_MAP, trace_loop
+
+
+def test_branch_leading_off_the_board(tmp_path: Path) -> None:
+    filename = tmp_path / "board.txt"
+    filename.write_text(".|...\n.S-7.\n.|.|.\n.L-J.\n")
+    grid = parse_board(filename, CHAR_MAP)
+    assert len(trace_loop(grid)) == 8
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-import itertools as it
 import logging
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable, NamedTuple, TypeAlias
 
 import numpy as np
 from numpy import typing as npt
@@ -19,30 +18,80 @@ def parse_board(lines: Iterable[str]) -> npt.NDArray[np.bool_]:
     return np.array([[c == "#" for c in line] for line in lines], dtype=np.bool_)
 
 
-def double_empty_rows(board: npt.NDArray[np.bool_]) -> npt.NDArray[np.bool_]:
-    pieces: list[npt.NDArray[np.bool_]] = []
-    for row in board:
-        if np.count_nonzero(row) == 0:
-            pieces.append(row)
-        pieces.append(row)
-    expanded = np.stack(pieces)
-    return expanded
+INT64_MAX = np.iinfo(np.int64).max
 
+# expanded coordinate of every original line, int64 or exact python ints
+CoordinateMap: TypeAlias = npt.NDArray[Any]
 
-def double_empty_columns(board: npt.NDArray[np.bool_]) -> npt.NDArray[np.bool_]:
-    height, width = board.shape
-    pieces: list[npt.NDArray[np.bool_]] = []
-    for col_idx in range(width):
-        col = board[:, col_idx]
-        if np.count_nonzero(col) == 0:
-            pieces.append(col)
-        pieces.append(col)
-    expanded = np.stack(pieces, axis=1)
-    return expanded
 
+def sum_of_pairwise_distances(values: npt.NDArray[Any]) -> int:
+    # After sorting, the i-th value is subtracted from the n-1-i larger ones
+    # and has the i smaller ones subtracted from it.
+    (n,) = values.shape
+    sorted_values = np.sort(values)
+    weights = 2 * np.arange(n, dtype=np.int64) - (n - 1)
+    largest_value = max(
+        abs(int(values.max(initial=0))), abs(int(values.min(initial=0)))
+    )
+    if n * n * largest_value <= INT64_MAX:
+        return int(np.dot(sorted_values, weights))
+    # exact python ints when int64 could overflow
+    return sum(int(v) * int(w) for v, w in zip(sorted_values, weights))
+
+
+def get_total_distance(galaxies: npt.NDArray[Any]) -> int:
+    # manhattan distances split into independent sums over both axes
+    return sum_of_pairwise_distances(galaxies[:, 0]) + sum_of_pairwise_distances(
+        galaxies[:, 1]
+    )
 
-def calculate_distance(a: tuple[int, int], b: tuple[int, int]) -> int:
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])  # manhattan distance
+
+def get_coordinate_map(occupied: npt.NDArray[np.bool_], factor: int) -> CoordinateMap:
+    # expanded coordinate of every original line, an empty line counts `factor` times
+    (number_of_lines,) = occupied.shape
+    if factor * number_of_lines <= INT64_MAX:
+        weights = np.where(occupied, np.int64(1), np.int64(factor))
+    else:
+        # exact python ints when int64 could overflow
+        weights = np.array(
+            [1 if o else factor for o in occupied.tolist()], dtype=object
+        )
+    coordinates: CoordinateMap = np.cumsum(weights) - weights
+    return coordinates
+
+
+class ExpandedUniverse(NamedTuple):
+    # expanded coordinate of every original row and column
+    row_map: CoordinateMap
+    col_map: CoordinateMap
+    # (n, 2) original row and column of every galaxy
+    galaxies: npt.NDArray[np.int64]
+
+    def coordinates(self) -> npt.NDArray[Any]:
+        return np.stack(
+            [self.row_map[self.galaxies[:, 0]], self.col_map[self.galaxies[:, 1]]],
+            axis=1,
+        )
+
+    def coordinates_of(self, galaxy: int) -> tuple[int, int]:
+        row, col = self.galaxies[galaxy]
+        return int(self.row_map[row]), int(self.col_map[col])
+
+    def distance(self, a: int, b: int) -> int:
+        a_y, a_x = self.coordinates_of(a)
+        b_y, b_x = self.coordinates_of(b)
+        return abs(a_y - b_y) + abs(a_x - b_x)  # manhattan distance
+
+    def total_distance(self) -> int:
+        return get_total_distance(self.coordinates())
+
+
+def expand(board: npt.NDArray[np.bool_], factor: int) -> ExpandedUniverse:
+    return ExpandedUniverse(
+        row_map=get_coordinate_map(np.any(board, axis=1), factor),
+        col_map=get_coordinate_map(np.any(board, axis=0), factor),
+        galaxies=np.argwhere(board).astype(np.int64),
+    )
 
 
 @wrap_main
@@ -50,18 +99,8 @@ def main(filename: Path) -> str:
     lines = get_stripped_lines(filename)
     board = parse_board(lines)
     logger.debug("Board %dx%d:\n%s", board.shape[0], board.shape[1], board)
-    expanded_board = double_empty_columns(double_empty_rows(board))
-    logger.debug(
-        "Expanded board %dx%d:\n%s",
-        expanded_board.shape[0],
-        expanded_board.shape[1],
-        expanded_board,
-    )
-
-    non_empty_indices = np.argwhere(expanded_board)
-    # non_empty_indices is a numpy array with y and x indices of each non-empty entry
-    distances = it.starmap(calculate_distance, it.combinations(non_empty_indices, 2))
-    return str(sum(distances))
+    universe = expand(board, 2)
+    return str(universe.total_distance())
 
 
 if __name__ == "__main__":
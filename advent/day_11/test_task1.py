@@ -0,0 +1,26 @@
+import numpy as np
+
+from .task_1 import expand
+
+
+def test_total_distance_with_large_factor() -> None:
+    board = np.zeros((12, 12), dtype=np.bool_)
+    board[0, 0] = board[11, 11] = True
+    for factor in [10**18, 2**70]:
+        expected = 2 * (10 * factor + 1)
+        assert expand(board, factor).total_distance() == expected
+
+
+def test_coordinates_with_large_factor() -> None:
+    board = np.zeros((4, 5), dtype=np.bool_)
+    board[0, 0] = board[3, 4] = board[1, 1] = True
+    factor = 2**64 + 3
+    universe = expand(board, factor)
+    assert universe.coordinates_of(1) == (1, 1)
+    assert universe.coordinates_of(2) == (2 + factor, 2 + 2 * factor)
+    assert universe.distance(0, 2) == 4 + 3 * factor
+    assert universe.coordinates().tolist() == [
+        [0, 0],
+        [1, 1],
+        [2 + factor, 2 + 2 * factor],
+    ]
@@ -2,13 +2,11 @@ from __future__ import annotations
 
 import itertools as it
 import logging
-import operator
 from pathlib import Path
-from typing import Iterable, List, Tuple, TypeAlias
+from typing import List, Tuple, TypeAlias
 
 import numpy as np
 from numpy import typing as npt
-from returns.curry import partial
 
 from ..cli_utils import wrap_main
 from ..io_utils import get_stripped_lines
@@ -39,43 +37,40 @@ def parse(line: str) -> Tuple[InputType, ChecksumType]:
     return parse_input(left), parse_totals(right)
 
 
-def count(candidate: InputType) -> Iterable[int]:
-    broken = 0
-    for c in candidate:
-        if c == BROKEN:
-            broken += 1
-        elif broken:
-            yield broken
-            broken = 0
-        else:
-            pass
-    if broken:
-        yield broken
-
-
-def is_valid(checksum: ChecksumType, candidate: InputType) -> bool:
-    return all(it.starmap(operator.eq, zip(checksum, count(candidate))))
-
-
-def get_candidates(input: InputType, checksum: ChecksumType) -> InputType:
-    base = np.where(input == BROKEN, np.uint8(BROKEN), np.uint8(FINE))
-    candidate = np.zeros_like(base)
-    already = np.count_nonzero(base)
-    total = sum(checksum)
-    missing = total - already
-    unknown_positions = np.argwhere(input == UNKNOWN)
-    for positions in it.combinations(unknown_positions, missing):
-        candidate[:] = base
-        candidate[list(positions)] = BROKEN
-        yield candidate
+def get_runs(input: InputType) -> List[int]:
+    # length of the run of possibly broken cells ending at every position,
+    # a group of size k can end at i only if runs[i] >= k
+    runs: List[int] = []
+    run = 0
+    for c in input.tolist():
+        run = run + 1 if c != FINE else 0
+        runs.append(run)
+    return runs
 
 
 def count_possibilities(input: InputType, checksum: ChecksumType) -> int:
-    candidates = get_candidates(input, checksum)
-    are_valid = map(partial(is_valid, checksum), candidates)
-    sum_valid = sum(are_valid)
-    logger.debug("Input %s %s produces %d valid positions", input, checksum, sum_valid)
-    return sum_valid
+    cells: List[int] = input.tolist()
+    runs = get_runs(input)
+    # ways[i] - arrangements of the groups placed so far within cells[:i]
+    ways = [1]
+    for c in cells:
+        ways.append(ways[-1] if c != BROKEN else 0)
+    for size in checksum:
+        new_ways = [0]
+        for i, c in enumerate(cells):
+            # cell i is fine and the groups fit before it
+            total = new_ways[i] if c != BROKEN else 0
+            # the group ends at cell i
+            start = i - size + 1
+            if runs[i] >= size:
+                if start == 0:
+                    total += ways[0]
+                elif cells[start - 1] != BROKEN:
+                    total += ways[start - 1]
+            new_ways.append(total)
+        ways = new_ways
+    logger.debug("Input %s %s produces %d valid positions", input, checksum, ways[-1])
+    return ways[-1]
 
 
 @wrap_main
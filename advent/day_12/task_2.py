@@ -1,37 +1,149 @@
 from __future__ import annotations
 
-import itertools as it
+import dbm
 import logging
+import multiprocessing as mp
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+import click
+import more_itertools as mit
 
 from ..cli_utils import wrap_main
 from ..io_utils import get_stripped_lines
 from ..logs import setup_logging
-from .task_1 import (
-    ChecksumType,
-    InputType,
-    count_possibilities,
-    parse_input,
-    parse_totals,
-)
+from .task_1 import ChecksumType, InputType, count_possibilities
+from .task_1 import parse as parse_folded
 
 logger = logging.getLogger(__name__)
 
+UNFOLD = 5
+CACHE_SIZE = 65536
+BATCH_SIZE = 4096
+
 
-def parse(line: str) -> Tuple[InputType, ChecksumType]:
+def unfold(line: str, factor: int = UNFOLD) -> str:
     left, right = line.split(" ")
-    left = "?".join(left for _ in range(5))
-    right = ",".join(right for _ in range(5))
-    return parse_input(left), parse_totals(right)
+    left = "?".join(left for _ in range(factor))
+    right = ",".join(right for _ in range(factor))
+    return f"{left} {right}"
+
+
+def parse(line: str, factor: int = UNFOLD) -> Tuple[InputType, ChecksumType]:
+    return parse_folded(unfold(line, factor))
+
+
+def get_key(line: str, factor: int = UNFOLD) -> str:
+    pattern, totals = unfold(line, factor).split(" ")
+    # runs of fine springs, also at both ends, do not change the count
+    pattern = ".".join(part for part in pattern.split(".") if part)
+    # and neither does reading the record backwards
+    reversed_totals = ",".join(reversed(totals.split(",")))
+    return min(f"{pattern} {totals}", f"{pattern[::-1]} {reversed_totals}")
+
+
+def count_key(key: str) -> int:
+    return count_possibilities(*parse_folded(key))
+
+
+@dataclass
+class CountCache:
+    # least recently used entries are evicted first
+    maxsize: int = CACHE_SIZE
+    store_path: Optional[Path] = None
+    memory: OrderedDict[str, int] = field(default_factory=OrderedDict)
+    store: Any = None
+
+    def __enter__(self) -> CountCache:
+        if self.store_path is not None:
+            self.store = dbm.open(str(self.store_path), "c")
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def get(self, key: str) -> Optional[int]:
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        if self.store is not None and key in self.store:
+            value = int(self.store[key])
+            self.remember(key, value)
+            return value
+        return None
+
+    def remember(self, key: str, value: int) -> None:
+        self.memory[key] = value
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def put(self, key: str, value: int) -> None:
+        self.remember(key, value)
+        if self.store is not None:
+            self.store[key] = str(value)
+
+
+def solve(
+    lines: Iterable[str],
+    *,
+    cache: CountCache,
+    factor: int = UNFOLD,
+    jobs: Optional[int] = None,
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[int]:
+    # yields the running total after every batch of lines
+    total = 0
+    with mp.Pool(jobs) as pool:
+        for batch in mit.chunked(lines, batch_size):
+            keys = [get_key(line, factor) for line in batch]
+            counts: dict[str, int] = {}
+            missing: list[str] = []
+            for key in dict.fromkeys(keys):
+                count = cache.get(key)
+                if count is None:
+                    missing.append(key)
+                else:
+                    counts[key] = count
+            logger.debug(
+                "Batch of %d lines: %d unique, %d cached",
+                len(keys),
+                len(counts) + len(missing),
+                len(counts),
+            )
+            for key, count in zip(missing, pool.imap(count_key, missing, 64)):
+                cache.put(key, count)
+                counts[key] = count
+            total += sum(counts[key] for key in keys)
+            yield total
 
 
 @wrap_main
-def main(filename: Path) -> str:
+@click.option("--unfold", "factor", default=UNFOLD, show_default=True)
+@click.option("--jobs", type=int, default=None, help="Worker processes.")
+@click.option("--cache-size", default=CACHE_SIZE, show_default=True)
+@click.option(
+    "--store",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Persist counts in this dbm file.",
+)
+def main(
+    filename: Path,
+    factor: int,
+    jobs: Optional[int],
+    cache_size: int,
+    store: Optional[Path],
+) -> str:
     lines = get_stripped_lines(filename)
-    entries = map(parse, lines)
-    counts = it.starmap(count_possibilities, entries)
-    return str(sum(counts))
+    total = 0
+    with CountCache(maxsize=cache_size, store_path=store) as cache:
+        for total in solve(lines, cache=cache, factor=factor, jobs=jobs):
+            logger.info("Running total: %d", total)
+    return str(total)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+import pytest
+
+from .task_1 import count_possibilities, parse
+from .task_2 import parse as parse_unfolded
+
+COUNT_TEST_CASES: list[tuple[str, int, int]] = [
+    ("???.### 1,1,3", 1, 1),
+    (".??..??...?##. 1,1,3", 4, 16384),
+    ("?#?#?#?#?#?#?#? 1,3,1,6", 1, 1),
+    ("????.#...#... 4,1,1", 1, 16),
+    ("????.######..#####. 1,6,5", 4, 2500),
+    ("?###???????? 3,2,1", 10, 506250),
+]
+
+
+@pytest.mark.parametrize("line,expected,expected_unfolded", COUNT_TEST_CASES)
+def test_count_possibilities(line: str, expected: int, expected_unfolded: int) -> None:
+    assert count_possibilities(*parse(line)) == expected
+    assert count_possibilities(*parse_unfolded(line)) == expected_unfolded
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Iterable, List, TypeAlias
+from typing import Iterable, List, NamedTuple, TypeAlias
 
 import numpy as np
 from numpy import typing as npt
@@ -35,63 +35,40 @@ class NotFound(Exception):
     pass
 
 
-def find_vertical_line(board: BoardType) -> int:
-    height, width = board.shape
-    for col in range(1, width):
-        left = board[:, :col]
-        _, left_width = left.shape
-        right = board[:, col:]
-        _, right_width = right.shape
-
-        left_part: BoardType
-        right_part: BoardType
-        if left_width < right_width:
-            left_part = left
-            right_part = right[:, :left_width]
-        elif left_width > right_width:
-            right_part = right
-            left_part = left[:, -right_width:]
-        else:  # equal
-            left_part = left
-            right_part = right_part
-        if np.all(left_part == right_part[:, ::-1]):
-            return col
-    raise NotFound()
+def encode_lines(board: BoardType) -> List[int]:
+    # every row of the board as a single integer bitmask
+    packed = np.packbits(board, axis=1)
+    return [int.from_bytes(row.tobytes(), "big") for row in packed]
 
 
-def find_horizontal_line(board: BoardType) -> int:
-    height, width = board.shape
-    for row in range(1, height):
-        top = board[:row, :]
-        top_height, _ = top.shape
-        bottom = board[row:, :]
-        bottom_height, _ = bottom.shape
-
-        top_part: BoardType
-        bottom_part: BoardType
-        if top_height > bottom_height:
-            bottom_part = bottom
-            top_part = top[-bottom_height:, :]
-        elif top_height < bottom_height:
-            top_part = top
-            bottom_part = bottom[:top_height, :]
-        else:  # equal
-            top_part = top
-            bottom_part = bottom
-
-        if np.all(top_part == bottom_part[::-1, :]):
-            return row
+def find_reflection(lines: List[int], smudges: int = 0) -> int:
+    # Reflection axis after the returned number of lines, for which exactly
+    # `smudges` cells differ between the mirrored halves.
+    for axis in range(1, len(lines)):
+        mismatches = 0
+        for offset in range(min(axis, len(lines) - axis)):
+            mismatches += (lines[axis - 1 - offset] ^ lines[axis + offset]).bit_count()
+            if mismatches > smudges:
+                break
+        else:
+            if mismatches == smudges:
+                return axis
     raise NotFound()
 
 
-@wrap_main
-def main(filename: Path) -> str:
-    lines = get_stripped_lines(filename)
-    boards = parse_boards(lines)
+def find_vertical_line(board: BoardType, smudges: int = 0) -> int:
+    return find_reflection(encode_lines(board.T), smudges)
+
+
+def find_horizontal_line(board: BoardType, smudges: int = 0) -> int:
+    return find_reflection(encode_lines(board), smudges)
+
+
+def summarize(boards: Iterable[BoardType], smudges: int = 0) -> int:
     summary = 0
     for i, board in enumerate(boards, 1):
         try:
-            col = find_vertical_line(board)
+            col = find_vertical_line(board, smudges)
         except NotFound:
             pass
         else:
@@ -99,14 +76,92 @@ def main(filename: Path) -> str:
             summary += col
             continue
         try:
-            row = find_horizontal_line(board)
+            row = find_horizontal_line(board, smudges)
         except NotFound:
             raise AssertionError(f"No split found in board {i}")
         else:
             logger.debug("Found horizontal line at line %d in board %d", row, i)
             summary += 100 * row
+    return summary
+
+
+# number of set bits in every byte value
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+MAX_LINE_LENGTH = 64
+
+
+class PackedBoards(NamedTuple):
+    # (boards, longest) bitmask of every row / column, padded with zeros
+    rows: npt.NDArray[np.uint64]
+    heights: npt.NDArray[np.int64]
+    cols: npt.NDArray[np.uint64]
+    widths: npt.NDArray[np.int64]
+
+
+def pack_boards(boards: Iterable[BoardType]) -> PackedBoards:
+    boards = list(boards)
+    heights = np.array([board.shape[0] for board in boards], dtype=np.int64)
+    widths = np.array([board.shape[1] for board in boards], dtype=np.int64)
+    if max(heights.max(), widths.max()) > MAX_LINE_LENGTH:
+        raise ValueError(f"Boards are limited to {MAX_LINE_LENGTH} cells per line")
+    powers = np.uint64(1) << np.arange(MAX_LINE_LENGTH, dtype=np.uint64)
+    rows = np.zeros((len(boards), heights.max()), dtype=np.uint64)
+    cols = np.zeros((len(boards), widths.max()), dtype=np.uint64)
+    for i, board in enumerate(boards):
+        height, width = board.shape
+        bits = board.astype(np.uint64)
+        rows[i, :height] = bits @ powers[:width]
+        cols[i, :width] = bits.T @ powers[:height]
+    return PackedBoards(rows=rows, heights=heights, cols=cols, widths=widths)
+
+
+def popcount(values: npt.NDArray[np.uint64]) -> npt.NDArray[np.int64]:
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(values).astype(np.int64)
+    as_bytes = np.ascontiguousarray(values).view(np.uint8)
+    counts: npt.NDArray[np.int64] = (
+        POPCOUNT[as_bytes].reshape(*values.shape, -1).sum(axis=-1)
+    )
+    return counts
+
+
+def find_reflections(
+    lines: npt.NDArray[np.uint64], lengths: npt.NDArray[np.int64], smudges: int = 0
+) -> npt.NDArray[np.int64]:
+    # reflection axis of every board, 0 where there is none
+    number_of_boards, longest = lines.shape
+    if longest < 2:
+        return np.zeros(number_of_boards, dtype=np.int64)
+    axes = np.arange(1, longest)
+    mismatches = np.zeros((number_of_boards, longest - 1), dtype=np.int64)
+    for offset in range(longest // 2):
+        # compare the offset-th pair of lines around every axis of every board
+        before = axes - 1 - offset
+        after = axes + offset
+        valid = (before >= 0) & (after < lengths[:, None])
+        differences = lines[:, before.clip(0)] ^ lines[:, after.clip(max=longest - 1)]
+        mismatches += np.where(valid, popcount(differences), 0)
+    candidates = (mismatches == smudges) & (axes < lengths[:, None])
+    return np.where(candidates.any(axis=1), candidates.argmax(axis=1) + 1, 0)
+
+
+def summarize_batch(
+    boards: Iterable[BoardType], smudges: int = 0
+) -> npt.NDArray[np.int64]:
+    packed = pack_boards(boards)
+    cols = find_reflections(packed.cols, packed.widths, smudges)
+    rows = find_reflections(packed.rows, packed.heights, smudges)
+    (missing,) = np.nonzero((cols == 0) & (rows == 0))
+    if len(missing):
+        raise AssertionError(f"No split found in board {missing[0] + 1}")
+    return np.where(cols > 0, cols, 100 * rows)
 
-    return str(summary)
+
+@wrap_main
+def main(filename: Path) -> str:
+    lines = get_stripped_lines(filename)
+    boards = parse_boards(lines)
+    return str(summarize_batch(boards).sum())
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Literal, NamedTuple
 
 import numpy as np
 from numpy import typing as npt
@@ -30,36 +30,58 @@ def parse(lines: Iterable[str]) -> BoardType:
     return np.array([[MAP[c] for c in line] for line in lines], dtype=np.uint8)
 
 
-def drop(board: BoardType) -> None:
+NORTH = 0
+WEST = 1
+SOUTH = 2
+EAST = 3
+
+# Flattening order that puts the cells of every tilted line next to each
+# other, and whether the rocks roll towards the start of those lines.
+TILT_LINES: dict[int, tuple[Literal["C", "F"], bool]] = {
+    NORTH: ("F", True),
+    SOUTH: ("F", False),
+    WEST: ("C", True),
+    EAST: ("C", False),
+}
+
+
+class Segments(NamedTuple):
+    order: Literal["C", "F"]
+    # flat index and length of every run of free cells or single static cell
+    starts: npt.NDArray[np.intp]
+    lengths: npt.NDArray[np.intp]
+    # distance of every cell from the side of its segment the rocks roll to
+    ranks: npt.NDArray[np.intp]
+    static: npt.NDArray[np.bool_]
+
+
+def get_segments(board: BoardType, direction: int) -> Segments:
+    # static rocks never move, so this only has to be done once per direction
+    order, towards_start = TILT_LINES[direction]
     height, width = board.shape
-    for row in range(1, height):
-        logger.debug("Analyzing row %d", row)
-        for col in range(width):
-            if board[row][col] != MOVING:  # this one can't fall
-                continue
-            # this stone can fall
-            logger.debug("Stone at %d,%d is movable", row, col)
-            for candidate_row in range(row - 1, 0 - 1, -1):
-                if board[candidate_row, col] == EMPTY:
-                    logger.debug(
-                        "Stone from %d,%d can fall to row %d", row, col, candidate_row
-                    )
-                    pass
-                else:
-                    logger.debug(
-                        "Stone %d,%d cannot fall past row %d", row, col, candidate_row
-                    )
-                    break
-            else:
-                # Can fall off the board
-                logger.debug("Stone from %d,%d could fall off the map", row, col)
-                candidate_row = -1
-                pass
-            logger.debug(
-                "Stone from %d,%d fell to %d,%d", row, col, candidate_row + 1, col
-            )
-            board[row, col] = EMPTY
-            board[candidate_row + 1, col] = MOVING
+    line_length = height if order == "F" else width
+    static = board.ravel(order=order) == STATIC
+    positions = np.arange(static.size)
+    is_start = positions % line_length == 0
+    is_start[1:] |= static[1:] | static[:-1]
+    starts = np.flatnonzero(is_start)
+    lengths = np.diff(starts, append=static.size)
+    ranks = positions - np.repeat(starts, lengths)
+    if not towards_start:
+        ranks = np.repeat(lengths, lengths) - 1 - ranks
+    return Segments(
+        order=order, starts=starts, lengths=lengths, ranks=ranks, static=static
+    )
+
+
+def tilt(board: BoardType, segments: Segments) -> BoardType:
+    moving = board.ravel(order=segments.order) == MOVING
+    counts = np.add.reduceat(moving, segments.starts, dtype=np.intp)
+    # the first `count` cells of every segment end up holding its rocks
+    settled = segments.ranks < np.repeat(counts, segments.lengths)
+    flat = settled.astype(np.uint8) * np.uint8(MOVING)
+    flat[segments.static] = STATIC
+    return flat.reshape(board.shape, order=segments.order)
 
 
 def get_load(board: BoardType) -> int:
@@ -75,8 +97,8 @@ def main(filename: Path) -> str:
     lines = get_stripped_lines(filename)
     board = parse(lines)
     logger.debug("Board:\n%s", board)
-    drop(board)
-    logger.debug("Dropped:\n%s", board)
+    board = tilt(board, get_segments(board, NORTH))
+    logger.debug("Tilted:\n%s", board)
     load = get_load(board)
     return str(load)
 
@@ -1,12 +1,29 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 from pathlib import Path
 
+import click
+import numpy as np
+
 from ..cli_utils import wrap_main
 from ..io_utils import get_stripped_lines
 from ..logs import setup_logging
-from .task_1 import MAP, BoardType, drop, get_load, parse
+from .task_1 import (
+    EAST,
+    MAP,
+    MOVING,
+    NORTH,
+    SOUTH,
+    WEST,
+    BoardType,
+    Segments,
+    get_load,
+    get_segments,
+    parse,
+    tilt,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,57 +33,57 @@ def visualize_board(board: BoardType) -> str:
     return "\n".join("".join(inverse_map[c] for c in row) for row in board)
 
 
-def cycle(board: BoardType) -> None:
-    drop(board)
-    logger.debug("After north:\n%s", visualize_board(board))
-    drop(board.T[:, ::-1])
-    logger.debug("After west:\n%s", visualize_board(board))
-    drop(board[::-1, :])
-    logger.debug("After south:\n%s", visualize_board(board))
-    drop(board.T[::-1, :])
-    logger.debug("After east:\n%s", visualize_board(board))
+CYCLE = [NORTH, WEST, SOUTH, EAST]
+CYCLES = 1_000_000_000
 
 
-@wrap_main
-def main(filename: Path) -> str:
-    lines = get_stripped_lines(filename)
-    board = parse(lines)
-    logger.info("Board:\n%s", visualize_board(board))
-    memory: list[str] = [
-        visualize_board(board),
-    ]
-    values: list[BoardType] = [
-        board.copy(),
-    ]
+def get_cycle_segments(board: BoardType) -> list[Segments]:
+    return [get_segments(board, direction) for direction in CYCLE]
+
+
+def cycle(board: BoardType, cycle_segments: list[Segments]) -> BoardType:
+    for segments in cycle_segments:
+        board = tilt(board, segments)
+    return board
+
+
+def get_state_key(board: BoardType) -> bytes:
+    # static rocks never move, so the rolling rocks alone identify a state
+    packed = np.packbits(board == MOVING)
+    return hashlib.blake2b(packed.tobytes(), digest_size=16).digest()
+
+
+def get_load_after(board: BoardType, cycles: int) -> int:
+    cycle_segments = get_cycle_segments(board)
+    first_seen: dict[bytes, int] = {}
+    loads: list[int] = []
     round = 0
-    while True:
-        cycle(board)
-        round += 1
-        key = visualize_board(board)
-        try:
-            index = memory.index(key)
-        except ValueError:
-            memory.append(key)
-            values.append(board.copy())
-            continue
-        else:
-            cycle_offset = index
-            cycle_len = round - index
-            logger.info(
-                "Found cycle len %d at round %d to round %d",
-                cycle_len,
-                round,
-                cycle_offset,
-            )
+    while round < cycles:
+        key = get_state_key(board)
+        if key in first_seen:
             break
+        first_seen[key] = round
+        loads.append(get_load(board))
+        board = cycle(board, cycle_segments)
+        round += 1
+    else:
+        return get_load(board)
 
-    target_rounds = 1000000000
-    target_rounds -= cycle_offset
-    target_rounds %= cycle_len
-    state = values[cycle_offset + target_rounds]
+    cycle_offset = first_seen[key]
+    cycle_len = round - cycle_offset
+    logger.info(
+        "Found cycle len %d at round %d to round %d", cycle_len, round, cycle_offset
+    )
+    return loads[cycle_offset + (cycles - cycle_offset) % cycle_len]
 
-    # logger.info("Cycle:\n%s", visualize_board(board))
-    load = get_load(state)
+
+@wrap_main
+@click.option("--cycles", default=CYCLES, show_default=True)
+def main(filename: Path, cycles: int) -> str:
+    lines = get_stripped_lines(filename)
+    board = parse(lines)
+    logger.debug("Board:\n%s", visualize_board(board))
+    load = get_load_after(board, cycles)
     return str(load)
 
 
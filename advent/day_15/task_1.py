@@ -3,6 +3,9 @@ from __future__ import annotations
 import logging
 from pathlib import Path
 
+import numpy as np
+from numpy import typing as npt
+
 from ..cli_utils import wrap_main
 from ..io_utils import get_stripped_lines
 from ..logs import setup_logging
@@ -19,13 +22,29 @@ def get_checksum(part: str) -> int:
     return current
 
 
+def get_checksums(sequence: str) -> npt.NDArray[np.uint8]:
+    # HASH of every comma separated step, all steps advance in lock-step
+    data = np.frombuffer(sequence.encode("ascii"), dtype=np.uint8)
+    separators = np.flatnonzero(data == ord(","))
+    starts = np.concatenate([[0], separators + 1])
+    ends = np.concatenate([separators, [len(data)]])
+    lengths = ends - starts
+    current = np.zeros(len(starts), dtype=np.uint8)
+    for column in range(int(lengths.max())):
+        # column of a padded (steps, longest step) byte matrix
+        characters = data[np.minimum(starts + column, len(data) - 1)]
+        # uint8 arithmetic wraps around, which takes care of the modulo 256
+        updated = (current + characters) * np.uint8(17)
+        current = np.where(column < lengths, updated, current)
+    return current
+
+
 @wrap_main
 def main(filename: Path) -> str:
     lines = get_stripped_lines(filename)
     (line,) = lines
-    parts = line.split(",")
-    checksums = map(get_checksum, parts)
-    return str(sum(checksums))
+    checksums = get_checksums(line)
+    return str(checksums.sum(dtype=np.int64))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import logging
 from pathlib import Path
 from typing import Iterable, TypeAlias
@@ -12,27 +13,22 @@ from .task_1 import get_checksum
 logger = logging.getLogger(__name__)
 
 
-BoxType: TypeAlias = list[tuple[str, int]]
+# label -> focal length, dicts keep the lenses in insertion order
+BoxType: TypeAlias = dict[str, int]
+
+
+@functools.cache
+def get_box_id(label: str) -> int:
+    return get_checksum(label)
 
 
 def execute_add(boxes: list[BoxType], label: str, lens: int) -> None:
-    box_id = get_checksum(label)
-    box = boxes[box_id]
-    for i, (exising_label, existing_lens) in enumerate(box):
-        if exising_label == label:
-            box[i] = (label, lens)  # replace
-            break
-    else:
-        box.append((label, lens))
+    # replacing an existing lens keeps its slot
+    boxes[get_box_id(label)][label] = lens
 
 
 def execute_remove(boxes: list[BoxType], label: str) -> None:
-    box_id = get_checksum(label)
-    boxes[box_id] = [
-        (existing_label, existing_lens)
-        for existing_label, existing_lens in boxes[box_id]
-        if existing_label != label
-    ]
+    boxes[get_box_id(label)].pop(label, None)
 
 
 def execute(boxes: list[BoxType], part: str) -> None:
@@ -47,12 +43,12 @@ def execute(boxes: list[BoxType], part: str) -> None:
 def print_boxes(boxes: list[BoxType]) -> None:
     for i, box in enumerate(boxes):
         if box:
-            logger.debug("\tBox %d: %s", i, box)
+            logger.debug("\tBox %d: %s", i, list(box.items()))
 
 
 def calc(boxes: list[BoxType]) -> Iterable[int]:
     for box_no, box in enumerate(boxes, 1):
-        for lens_no, (label, focal) in enumerate(box, 1):
+        for lens_no, focal in enumerate(box.values(), 1):
             yield box_no * lens_no * focal
 
 
@@ -61,11 +57,13 @@ def main(filename: Path) -> str:
     lines = get_stripped_lines(filename)
     (line,) = lines
     parts = line.split(",")
-    boxes: list[BoxType] = [[] for _ in range(256)]
+    boxes: list[BoxType] = [{} for _ in range(256)]
+    debug = logger.isEnabledFor(logging.DEBUG)
     for part in parts:
-        logger.debug("Executing %s", part)
         execute(boxes, part)
-        print_boxes(boxes)
+        if debug:
+            logger.debug("Executing %s", part)
+            print_boxes(boxes)
     focusing_powers = calc(boxes)
     return str(sum(focusing_powers))
 
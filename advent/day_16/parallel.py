@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+import math
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import click
+import more_itertools as mit
+import numpy as np
+from numpy import typing as npt
+
+from ..cli_utils import wrap_main
+from ..io_utils import parse_board
+from ..logs import setup_logging
+from .task_1 import CHAR_MAP, Beam, JumpTables, build_jump_tables
+from .task_2 import get_edge_beams, simulate
+
+logger = logging.getLogger(__name__)
+
+
+class SharedArray(NamedTuple):
+    # enough to attach to an array living in shared memory
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+def share(array: npt.NDArray[np.generic]) -> tuple[SharedMemory, SharedArray]:
+    memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared: npt.NDArray[np.generic] = np.ndarray(
+        array.shape, dtype=array.dtype, buffer=memory.buf
+    )
+    shared[...] = array
+    return memory, SharedArray(memory.name, array.shape, array.dtype.str)
+
+
+def attach(spec: SharedArray) -> tuple[SharedMemory, npt.NDArray[np.generic]]:
+    memory = SharedMemory(name=spec.name)
+    array: npt.NDArray[np.generic] = np.ndarray(
+        spec.shape, dtype=np.dtype(spec.dtype), buffer=memory.buf
+    )
+    return memory, array
+
+
+# set up once in every worker, the segments keep the shared buffers alive
+worker_tables: Optional[JumpTables] = None
+worker_memory: list[SharedMemory] = []
+
+
+def init_worker(board_spec: SharedArray, stops_spec: SharedArray) -> None:
+    global worker_tables
+    board_memory, board = attach(board_spec)
+    stops_memory, stops = attach(stops_spec)
+    worker_memory.extend([board_memory, stops_memory])
+    worker_tables = JumpTables(board=board, stops=stops)  # type: ignore[arg-type]
+
+
+def simulate_chunk(beams: list[Beam]) -> int:
+    assert worker_tables is not None
+    return max(simulate(worker_tables, beam) for beam in beams)
+
+
+def find_max_energized(
+    tables: JumpTables, beams: list[Beam], *, jobs: Optional[int] = None
+) -> int:
+    jobs = jobs or mp.cpu_count()
+    # a few chunks per worker keeps them busy when entries differ in cost
+    chunk_size = max(1, math.ceil(len(beams) / (jobs * 4)))
+    board_memory, board_spec = share(tables.board)
+    stops_memory, stops_spec = share(tables.stops)
+    try:
+        with mp.Pool(
+            jobs, initializer=init_worker, initargs=(board_spec, stops_spec)
+        ) as pool:
+            # chunks are reduced in submission order, so the result does not
+            # depend on scheduling
+            maxima = pool.map(simulate_chunk, mit.chunked(beams, chunk_size))
+    finally:
+        for memory in (board_memory, stops_memory):
+            memory.close()
+            memory.unlink()
+    return max(maxima)
+
+
+@wrap_main
+@click.option("--jobs", type=int, default=None, help="Worker processes.")
+def main(filename: Path, jobs: Optional[int]) -> str:
+    board = parse_board(filename, CHAR_MAP)
+    tables = build_jump_tables(board)
+    height, width = board.shape
+    beams = get_edge_beams(height, width)
+    return str(find_max_energized(tables, beams, jobs=jobs))
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -29,62 +29,89 @@ CHAR_MAP = {
     "|": VERTICAL_SPLITTER,
 }
 
+UP = 0
+RIGHT = 1
+DOWN = 2
+LEFT = 3
+
+# (row, column) offset of a single step in every direction
+OFFSETS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+# optical element -> incoming direction -> outgoing directions
+OUTGOING: dict[int, list[tuple[int, ...]]] = {
+    MIRROR_SLASH: [(RIGHT,), (UP,), (LEFT,), (DOWN,)],
+    MIRROR_BACKSLASH: [(LEFT,), (DOWN,), (RIGHT,), (UP,)],
+    HORIZONTAL_SPLITTER: [(LEFT, RIGHT), (RIGHT,), (LEFT, RIGHT), (LEFT,)],
+    VERTICAL_SPLITTER: [(UP,), (UP, DOWN), (DOWN,), (UP, DOWN)],
+}
 
-class Point(NamedTuple):
-    y: int
-    x: int
 
-    def add(self, other: Point) -> Point:
-        return Point(self.y + other.y, self.x + other.x)
+class Beam(NamedTuple):
+    # cell the beam is about to enter
+    row: int
+    col: int
+    direction: int
 
 
-LEFT = Point(0, -1)
-RIGHT = Point(0, 1)
-UP = Point(-1, 0)
-DOWN = Point(1, 0)
+class JumpTables(NamedTuple):
+    board: npt.NDArray[np.uint8]
+    # (4, height, width) row or column of the first optical element at or
+    # beyond every cell in every direction, -1 / height / width if there is none
+    stops: npt.NDArray[np.int32]
 
 
-def light_up(
-    *,
-    board: npt.NDArray[np.uint8],
-    energized: npt.NDArray[np.bool_],
-    position: Point,
-    direction: Point,
-    rays: deque[tuple[Point, Point]],
-    memory: dict[tuple[Point, Point], bool],
-) -> None:
+def build_jump_tables(board: npt.NDArray[np.uint8]) -> JumpTables:
+    height, width = board.shape
+    occupied = board != EMPTY
+    rows = np.arange(height, dtype=np.int32)[:, None]
+    cols = np.arange(width, dtype=np.int32)[None, :]
+    stops = np.empty((4, height, width), dtype=np.int32)
+    stops[UP] = np.maximum.accumulate(np.where(occupied, rows, -1), axis=0)
+    stops[LEFT] = np.maximum.accumulate(np.where(occupied, cols, -1), axis=1)
+    stops[DOWN] = np.minimum.accumulate(
+        np.where(occupied, rows, height)[::-1, :], axis=0
+    )[::-1, :]
+    stops[RIGHT] = np.minimum.accumulate(
+        np.where(occupied, cols, width)[:, ::-1], axis=1
+    )[:, ::-1]
+    return JumpTables(board=board, stops=stops)
+
+
+def energize(tables: JumpTables, start: Beam) -> npt.NDArray[np.bool_]:
+    board, stops = tables
     height, width = board.shape
-    while True:
-        if (position, direction) in memory:
-            return
-        memory[position, direction] = True
-        new_position = position.add(direction)
-        if not (0 <= new_position.y < height and 0 <= new_position.x < width):
-            return  # out of bounds
-        new_cell = board[new_position]
-        energized[new_position] = True  # the light made it this far
-        if new_cell == EMPTY:
-            pass
-        elif new_cell == MIRROR_SLASH:
-            direction = Point(-direction.x, -direction.y)
-        elif new_cell == MIRROR_BACKSLASH:
-            direction = Point(direction.x, direction.y)
-            pass
-        elif new_cell == HORIZONTAL_SPLITTER and direction.y == 0:
-            pass
-        elif new_cell == HORIZONTAL_SPLITTER:
-            rays.append((new_position, LEFT))
-            rays.append((new_position, RIGHT))
-            return
-        elif new_cell == VERTICAL_SPLITTER and direction.x == 0:
-            pass
-        elif new_cell == VERTICAL_SPLITTER:
-            rays.append((new_position, UP))
-            rays.append((new_position, DOWN))
-            return
+    energized = np.zeros_like(board, dtype=np.bool_)
+    # outgoing directions already taken from every optical element, as bits
+    visited = np.zeros_like(board, dtype=np.uint8)
+    beams = deque([start])
+    while beams:
+        row, col, direction = beams.popleft()
+        if not (0 <= row < height and 0 <= col < width):
+            continue  # out of bounds
+        # light up the whole segment up to the next optical element at once
+        stop = int(stops[direction, row, col])
+        if direction == UP:
+            energized[max(stop, 0) : row + 1, col] = True
+            row = stop
+        elif direction == DOWN:
+            energized[row : stop + 1, col] = True
+            row = stop
+        elif direction == LEFT:
+            energized[row, max(stop, 0) : col + 1] = True
+            col = stop
         else:
-            raise ValueError(f"Unknown cell: {new_cell}")
-        position = new_position
+            energized[row, col : stop + 1] = True
+            col = stop
+        if not (0 <= row < height and 0 <= col < width):
+            continue  # the beam left the board
+        for outgoing in OUTGOING[board[row, col]][direction]:
+            bit = 1 << outgoing
+            if visited[row, col] & bit:
+                continue
+            visited[row, col] |= bit
+            row_offset, col_offset = OFFSETS[outgoing]
+            beams.append(Beam(row + row_offset, col + col_offset, outgoing))
+    return energized
 
 
 def visualize_energized(energized: npt.NDArray[np.bool_]) -> str:
@@ -94,21 +121,9 @@ def visualize_energized(energized: npt.NDArray[np.bool_]) -> str:
 @wrap_main
 def main(filename: Path) -> str:
     board = parse_board(filename, CHAR_MAP)
-    energized = np.zeros_like(board, dtype=np.bool_)
-    # start just beyond the board heading right
-    rays = deque([(Point(0, -1), RIGHT)])
-    memory: dict[tuple[Point, Point], bool] = {}
-    while rays:
-        position, direction = rays.popleft()
-        light_up(
-            board=board,
-            energized=energized,
-            position=position,
-            direction=direction,
-            rays=rays,
-            memory=memory,
-        )
-
+    tables = build_jump_tables(board)
+    # start at the top left corner heading right
+    energized = energize(tables, Beam(0, 0, RIGHT))
     logger.debug("Board:\n%s", visualize_energized(energized))
     return str(np.count_nonzero(energized))
 
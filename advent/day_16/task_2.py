@@ -1,58 +1,160 @@
 from __future__ import annotations
 
+import functools
+import itertools as it
 import logging
-from collections import deque
 from pathlib import Path
+from typing import NamedTuple, TypeAlias
 
+import networkx as nx
 import numpy as np
-from numpy import typing as npt
 
 from ..cli_utils import wrap_main
 from ..io_utils import parse_board
 from ..logs import setup_logging
-from .task_1 import CHAR_MAP, DOWN, LEFT, RIGHT, UP, Point, light_up
+from .task_1 import (
+    CHAR_MAP,
+    DOWN,
+    EMPTY,
+    LEFT,
+    OFFSETS,
+    OUTGOING,
+    RIGHT,
+    UP,
+    Beam,
+    JumpTables,
+    build_jump_tables,
+    energize,
+)
 
 logger = logging.getLogger(__name__)
 
+# optical element row, column and the direction the beam leaves it in
+State: TypeAlias = tuple[int, int, int]
 
-def simulate(point: Point, direction: Point, board: npt.NDArray[np.uint8]) -> int:
-    energized = np.zeros_like(board, dtype=np.bool_)
-    rays = deque([(point, direction)])
-    memory: dict[tuple[Point, Point], bool] = {}
-    while rays:
-        position, direction = rays.popleft()
-        light_up(
-            board=board,
-            energized=energized,
-            position=position,
-            direction=direction,
-            rays=rays,
-            memory=memory,
-        )
-    return np.count_nonzero(energized)
+
+def simulate(tables: JumpTables, start: Beam) -> int:
+    return int(np.count_nonzero(energize(tables, start)))
+
+
+def get_edge_beams(height: int, width: int) -> list[Beam]:
+    return [
+        *(Beam(row, 0, RIGHT) for row in range(height)),
+        *(Beam(row, width - 1, LEFT) for row in range(height)),
+        *(Beam(0, col, DOWN) for col in range(width)),
+        *(Beam(height - 1, col, UP) for col in range(width)),
+    ]
+
+
+@functools.cache
+def get_column_bits(width: int, length: int) -> int:
+    # bits of `length` vertically adjacent cells, starting at bit 0
+    return sum(1 << (k * width) for k in range(length))
+
+
+def follow(tables: JumpTables, beam: Beam) -> tuple[int, list[State]]:
+    # Cells lit by the beam up to the next optical element, as a bitset of
+    # row-major cell indices, and the states the beam continues in from there.
+    board, stops = tables
+    height, width = board.shape
+    row, col, direction = beam
+    if not (0 <= row < height and 0 <= col < width):
+        return 0, []
+    stop = int(stops[direction, row, col])
+    if direction in (UP, DOWN):
+        first, last = sorted((row, max(0, min(stop, height - 1))))
+        bits = get_column_bits(width, last - first + 1) << (first * width + col)
+        row = stop
+    else:
+        first, last = sorted((col, max(0, min(stop, width - 1))))
+        bits = ((1 << (last - first + 1)) - 1) << (row * width + first)
+        col = stop
+    if not (0 <= row < height and 0 <= col < width):
+        return bits, []
+    outgoing = OUTGOING[board[row, col]][direction]
+    return bits, [(row, col, d) for d in outgoing]
+
+
+def get_leaving_beam(state: State) -> Beam:
+    row, col, direction = state
+    row_offset, col_offset = OFFSETS[direction]
+    return Beam(row + row_offset, col + col_offset, direction)
+
+
+class BeamGraph(NamedTuple):
+    # state -> strongly connected component
+    mapping: dict[State, int]
+    # component -> bitset of every cell lit from any of its states, only kept
+    # for the components the entry beams lead into
+    reach: dict[int, int]
+
+
+def build_beam_graph(tables: JumpTables, entries: list[Beam]) -> BeamGraph:
+    board, _ = tables
+    graph = nx.DiGraph()
+    for row, col in np.argwhere(board != EMPTY).tolist():
+        for direction in set(it.chain.from_iterable(OUTGOING[board[row, col]])):
+            state = (row, col, direction)
+            _, successors = follow(tables, get_leaving_beam(state))
+            graph.add_node(state)
+            graph.add_edges_from((state, successor) for successor in successors)
+
+    # beams inside a component light each other up, so the condensation
+    # is a DAG and every component's reach is computed once, sinks first
+    condensation = nx.condensation(graph)
+    mapping = condensation.graph["mapping"]
+    logger.debug(
+        "Beam graph: %d states, %d components",
+        graph.number_of_nodes(),
+        condensation.number_of_nodes(),
+    )
+    wanted = {mapping[state] for beam in entries for state in follow(tables, beam)[1]}
+    relevant = set(wanted)
+    stack = list(wanted)
+    while stack:
+        for successor in condensation.successors(stack.pop()):
+            if successor not in relevant:
+                relevant.add(successor)
+                stack.append(successor)
+    # Every bitset spans the whole grid, so it is dropped as soon as all the
+    # components leading into it have taken it over. Segment bits are cheap
+    # to recompute and not stored either.
+    pending = {
+        component: sum(p in relevant for p in condensation.predecessors(component))
+        for component in relevant
+    }
+    reach: dict[int, int] = {}
+    for component in reversed(list(nx.topological_sort(condensation))):
+        if component not in relevant:
+            continue
+        bits = 0
+        for state in condensation.nodes[component]["members"]:
+            bits |= follow(tables, get_leaving_beam(state))[0]
+        for successor in condensation.successors(component):
+            bits |= reach[successor]
+            pending[successor] -= 1
+            if not pending[successor] and successor not in wanted:
+                del reach[successor]
+        if pending[component] or component in wanted:
+            reach[component] = bits
+    return BeamGraph(mapping=mapping, reach=reach)
+
+
+def count_energized(tables: JumpTables, graph: BeamGraph, start: Beam) -> int:
+    bits, successors = follow(tables, start)
+    for state in successors:
+        bits |= graph.reach[graph.mapping[state]]
+    return bits.bit_count()
 
 
 @wrap_main
 def main(filename: Path) -> str:
     board = parse_board(filename, CHAR_MAP)
-    # start just beyond the board heading right
-    max_energized = 0
+    tables = build_jump_tables(board)
     height, width = board.shape
-    for row in range(height):
-        # try rays going left-to-right
-        energized = simulate(Point(row, -1), RIGHT, board)
-        max_energized = max(max_energized, energized)
-        # try rays going right-to-left
-        energized = simulate(Point(row, width), LEFT, board)
-        max_energized = max(max_energized, energized)
-    for col in range(width):
-        # try rays going top-to-bottom
-        energized = simulate(Point(-1, col), DOWN, board)
-        max_energized = max(max_energized, energized)
-        # try rays going bottom-to-top
-        energized = simulate(Point(height, col), UP, board)
-        max_energized = max(max_energized, energized)
-
+    beams = get_edge_beams(height, width)
+    graph = build_beam_graph(tables, beams)
+    max_energized = max(count_energized(tables, graph, beam) for beam in beams)
     return str(max_energized)
 
 
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import heapq
+import logging
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple
+
+import click
+import numpy as np
+
+from ..cli_utils import wrap_main
+from ..io_utils import parse_board
+from ..logs import setup_logging
+from .task_1 import (
+    ALMOST_INFINITY,
+    MAX_MOVE,
+    MIN_MOVE,
+    CostTables,
+    build_cost_tables,
+    get_neighbours,
+    get_offsets,
+    get_state,
+)
+
+logger = logging.getLogger(__name__)
+
+Cell = tuple[int, int]
+Heuristic = Callable[[int], int]
+Expand = Callable[[CostTables, int], Iterator[tuple[int, int]]]
+
+
+class SearchResult(NamedTuple):
+    cost: int
+    expanded: int
+
+
+def get_cell_states(cell: Cell, width: int) -> list[int]:
+    # the crucible may be in a cell in either orientation
+    row, col = cell
+    return [get_state(row, col, False, width), get_state(row, col, True, width)]
+
+
+def get_heuristic(target: Cell, width: int, min_cost: int) -> Heuristic:
+    # Every move enters at least one block per step of Manhattan distance and
+    # loses at least min_cost heat in each, so the estimate is admissible and
+    # consistent. With min_cost = 0 the search degrades to plain Dijkstra.
+    target_row, target_col = target
+
+    def heuristic(state: int) -> int:
+        row, col = divmod(state >> 1, width)
+        return (abs(row - target_row) + abs(col - target_col)) * min_cost
+
+    return heuristic
+
+
+def get_predecessors(tables: CostTables, state: int) -> Iterator[tuple[int, int]]:
+    # the reverse of get_neighbours, (previous state, cost) pairs
+    height, width, rows, cols, offsets = tables
+    position, arrived_vertically = divmod(state, 2)
+    row, col = divmod(position, width)
+    if arrived_vertically:
+        sums, current, size = cols[col], row, height
+    else:
+        sums, current, size = rows[row], col, width
+    for offset in offsets:
+        origin = current - offset
+        if not 0 <= origin < size:
+            continue
+        if offset > 0:
+            cost = sums[current + 1] - sums[origin + 1]
+        else:
+            cost = sums[origin] - sums[current]
+        if arrived_vertically:
+            yield get_state(origin, col, False, width), cost
+        else:
+            yield get_state(row, origin, True, width), cost
+
+
+def find_path_astar(
+    tables: CostTables, start: Cell, end: Cell, *, min_cost: int
+) -> SearchResult:
+    width = tables.width
+    heuristic = get_heuristic(end, width, min_cost)
+    ends = set(get_cell_states(end, width))
+    distances = [ALMOST_INFINITY] * (tables.height * width * 2)
+    queue: list[tuple[int, int, int]] = []
+    for state in get_cell_states(start, width):
+        distances[state] = 0
+        queue.append((heuristic(state), 0, state))
+    heapq.heapify(queue)
+    expanded = 0
+    while queue:
+        _, distance, current = heapq.heappop(queue)
+        if distance > distances[current]:
+            continue  # already reached with a lower cost
+        if current in ends:
+            return SearchResult(distance, expanded)
+        expanded += 1
+        for neighbour, jump_cost in get_neighbours(tables, current):
+            cost = distance + jump_cost
+            if cost < distances[neighbour]:
+                distances[neighbour] = cost
+                heapq.heappush(queue, (cost + heuristic(neighbour), cost, neighbour))
+    raise ValueError("End is not reachable")
+
+
+def find_path_bidirectional(
+    tables: CostTables, start: Cell, end: Cell, *, min_cost: int
+) -> SearchResult:
+    # A* from both ends at once. Both searches use the average of the two
+    # heuristics as potential (negated backwards), which keeps every reduced
+    # cost non-negative on both sides. The smallest keys of the two frontiers
+    # then add up to a lower bound on any path not seen yet, so the best meeting
+    # cost is final once they reach it. Keys are doubled to stay integral.
+    width = tables.width
+    size = tables.height * width * 2
+    expands: tuple[Expand, Expand] = (get_neighbours, get_predecessors)
+    to_end = get_heuristic(end, width, min_cost)
+    to_start = get_heuristic(start, width, min_cost)
+    potentials: tuple[Heuristic, Heuristic] = (
+        lambda state: to_end(state) - to_start(state),
+        lambda state: to_start(state) - to_end(state),
+    )
+    distances = ([ALMOST_INFINITY] * size, [ALMOST_INFINITY] * size)
+    queues: tuple[list[tuple[int, int, int]], list[tuple[int, int, int]]] = ([], [])
+    for side, cell in enumerate((start, end)):
+        for state in get_cell_states(cell, width):
+            distances[side][state] = 0
+            queues[side].append((potentials[side](state), 0, state))
+        heapq.heapify(queues[side])
+    # cheapest complete path seen so far
+    best = 0 if start == end else ALMOST_INFINITY
+    expanded = 0
+    while True:
+        for queue, own in zip(queues, distances):
+            while queue and queue[0][1] > own[queue[0][2]]:
+                heapq.heappop(queue)  # already reached with a lower cost
+        if not (queues[0] and queues[1]):
+            break
+        if queues[0][0][0] + queues[1][0][0] >= 2 * best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        _, distance, current = heapq.heappop(queues[side])
+        expanded += 1
+        potential, own, other = potentials[side], distances[side], distances[1 - side]
+        for neighbour, jump_cost in expands[side](tables, current):
+            cost = distance + jump_cost
+            if cost < own[neighbour]:
+                own[neighbour] = cost
+                heapq.heappush(
+                    queues[side], (2 * cost + potential(neighbour), cost, neighbour)
+                )
+                best = min(best, cost + other[neighbour])
+    if best >= ALMOST_INFINITY:
+        raise ValueError("End is not reachable")
+    return SearchResult(best, expanded)
+
+
+@wrap_main
+@click.option("--min-move", default=MIN_MOVE, show_default=True)
+@click.option("--max-move", default=MAX_MOVE, show_default=True)
+@click.option(
+    "--astar/--dijkstra",
+    default=True,
+    show_default=True,
+    help="Guide the search with a Manhattan distance estimate.",
+)
+@click.option("--bidirectional", is_flag=True, help="Search from both ends.")
+@click.option(
+    "--query",
+    "queries",
+    type=(int, int, int, int),
+    multiple=True,
+    help="Start row, start column, end row and end column. [default: corners]",
+)
+def main(
+    filename: Path,
+    min_move: int,
+    max_move: int,
+    astar: bool,
+    bidirectional: bool,
+    queries: tuple[tuple[int, int, int, int], ...],
+) -> str:
+    board = parse_board(filename, {c: int(c) for c in "123456789"})
+    height, width = board.shape
+    tables = build_cost_tables(board, get_offsets(min_move, max_move))
+    min_cost = int(np.min(board)) if astar else 0
+    find_path = find_path_bidirectional if bidirectional else find_path_astar
+    costs = []
+    for start_row, start_col, end_row, end_col in queries or [
+        (0, 0, height - 1, width - 1)
+    ]:
+        start, end = (start_row, start_col), (end_row, end_col)
+        for row, col in (start, end):
+            # get_state would silently wrap columns onto the neighbouring row
+            if not (0 <= row < height and 0 <= col < width):
+                raise click.BadParameter(
+                    f"({row}, {col}) is outside the {height}x{width} board",
+                    param_hint="'--query'",
+                )
+        cost, expanded = find_path(tables, start, end, min_cost=min_cost)
+        logger.info("%s -> %s: cost %d, expanded %d states", start, end, cost, expanded)
+        costs.append(str(cost))
+    return "\n".join(costs)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
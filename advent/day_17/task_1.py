@@ -1,8 +1,9 @@
+import heapq
 import logging
-from collections import defaultdict
 from pathlib import Path
-from typing import NamedTuple, TypeAlias
+from typing import Iterator, NamedTuple
 
+import click
 import numpy as np
 from numpy import typing as npt
 
@@ -13,97 +14,112 @@ from ..logs import setup_logging
 logger = logging.getLogger(__name__)
 
 
-class Node(NamedTuple):
-    row: int
-    col: int
-    previous_move_was_vertical: bool
+MIN_MOVE = 1
+MAX_MOVE = 3
 
 
-OFFSETS = [-3, -2, -1, 1, 2, 3]
-GraphType: TypeAlias = dict[Node, dict[Node, int]]
+def get_offsets(min_move: int, max_move: int) -> list[int]:
+    moves = list(range(min_move, max_move + 1))
+    return [-move for move in reversed(moves)] + moves
 
 
-def build_graph(board: npt.NDArray[np.uint8], offsets: list[int]) -> GraphType:
-    # undirected graph
-    # starting_node -> ending_node -> distance
-    graph: GraphType = defaultdict(dict)
+class CostTables(NamedTuple):
+    height: int
+    width: int
+    # rows[row][col] is the heat lost in the first col blocks of the row,
+    # cols[col][row] likewise for the first row blocks of the column
+    rows: list[list[int]]
+    cols: list[list[int]]
+    offsets: list[int]
+
+
+def get_state(row: int, col: int, previous_move_was_vertical: bool, width: int) -> int:
+    return (row * width + col) * 2 + previous_move_was_vertical
+
+
+def build_cost_tables(board: npt.NDArray[np.uint8], offsets: list[int]) -> CostTables:
     height, width = board.shape
-    for row in range(height):
-        for col in range(width):
-            for offset in offsets:
-                if 0 <= (target_row := row + offset) < height:
-                    # consider vertical moves
-                    current_node = Node(row, col, False)
-                    target_node = Node(target_row, col, True)
-                    if offset < 0:
-                        cost = board[target_row:row, col].sum(dtype=np.uint32)
-                    else:
-                        cost = board[row + 1 : target_row + 1, col].sum(dtype=np.uint32)
-                    graph[current_node][target_node] = cost.tolist()
-                if 0 <= (target_col := col + offset) < width:
-                    # consider horizontal moves
-                    current_node = Node(row, col, True)
-                    target_node = Node(row, target_col, False)
-                    if offset < 0:
-                        cost = board[row, target_col:col].sum(dtype=np.uint32)
-                    else:
-                        cost = board[row, col + 1 : target_col + 1].sum(dtype=np.uint32)
-                    graph[current_node][target_node] = cost.tolist()
-
-    return graph
+    rows = np.zeros((height, width + 1), dtype=np.int64)
+    np.cumsum(board, axis=1, out=rows[:, 1:])
+    cols = np.zeros((width, height + 1), dtype=np.int64)
+    np.cumsum(board.T, axis=1, out=cols[:, 1:])
+    return CostTables(height, width, rows.tolist(), cols.tolist(), offsets)
+
+
+def get_neighbours(tables: CostTables, state: int) -> Iterator[tuple[int, int]]:
+    # (neighbour state, cost) pairs, generated on demand instead of stored
+    height, width, rows, cols, offsets = tables
+    position, previous_move_was_vertical = divmod(state, 2)
+    row, col = divmod(position, width)
+    if previous_move_was_vertical:
+        sums, current, size = rows[row], col, width
+    else:
+        sums, current, size = cols[col], row, height
+    for offset in offsets:
+        target = current + offset
+        if not 0 <= target < size:
+            continue
+        # heat is lost in every block entered, but not in the one left
+        if offset > 0:
+            cost = sums[target + 1] - sums[current + 1]
+        else:
+            cost = sums[current] - sums[target]
+        if previous_move_was_vertical:
+            yield get_state(row, target, False, width), cost
+        else:
+            yield get_state(target, col, True, width), cost
 
 
 ALMOST_INFINITY = 2**32 - 1
 
 
-def find_path(
-    *, height: int, width: int, graph: GraphType, start: Node, ends: set[Node]
-) -> int:
-    unvisited: set[Node] = set()
-    for row in range(height):
-        for col in range(width):
-            unvisited.add(Node(row, col, False))
-            unvisited.add(Node(row, col, True))
-    total = len(unvisited)
-    logger.debug("Nodes to visit: %d", total)
-    distances: dict[Node, int] = defaultdict(lambda: ALMOST_INFINITY)
-    distances[start] = 0
-    current = start
-    while True:
-        for neighbour, jump_cost in graph[current].items():
-            if neighbour not in unvisited:
-                continue
-            cost = distances[current] + jump_cost
-            distances[neighbour] = min(distances[neighbour], cost)
-        unvisited.remove(current)
-        if not unvisited:
-            break
-        current = min(unvisited, key=distances.__getitem__)
-        assert distances[current] != ALMOST_INFINITY
-        if len(unvisited) % 100 == 0:
-            logger.debug(
-                "Nodes to visit: %d/%d (%.1f%%)",
-                len(unvisited),
-                total,
-                len(unvisited) / total * 100,
-            )
-    return min(distances[end] for end in ends)
+def find_path(*, tables: CostTables, starts: list[int], ends: set[int]) -> int:
+    # Dijkstra with a binary heap and lazy deletion of outdated entries,
+    # all starts share a single run
+    size = tables.height * tables.width * 2
+    distances = [ALMOST_INFINITY] * size
+    queue: list[tuple[int, int]] = []
+    for start in starts:
+        distances[start] = 0
+        queue.append((0, start))
+    heapq.heapify(queue)
+    expanded = 0
+    while queue:
+        distance, current = heapq.heappop(queue)
+        if distance > distances[current]:
+            continue  # already reached with a lower cost
+        if current in ends:
+            logger.debug("Expanded %d of %d states", expanded, size)
+            return distance
+        expanded += 1
+        for neighbour, jump_cost in get_neighbours(tables, current):
+            cost = distance + jump_cost
+            if cost < distances[neighbour]:
+                distances[neighbour] = cost
+                heapq.heappush(queue, (cost, neighbour))
+    raise ValueError("End is not reachable")
+
+
+def get_starts_and_ends(height: int, width: int) -> tuple[list[int], set[int]]:
+    # the crucible may leave the top left corner in either orientation
+    starts = [get_state(0, 0, False, width), get_state(0, 0, True, width)]
+    ends = {
+        get_state(height - 1, width - 1, False, width),
+        get_state(height - 1, width - 1, True, width),
+    }
+    return starts, ends
 
 
 @wrap_main
-def main(filename: Path) -> str:
+@click.option("--min-move", default=MIN_MOVE, show_default=True)
+@click.option("--max-move", default=MAX_MOVE, show_default=True)
+def main(filename: Path, min_move: int, max_move: int) -> str:
     board = parse_board(filename, {c: int(c) for c in "123456789"})
     height, width = board.shape
     logger.debug("Board:\n%s", board)
-    graph = build_graph(board, OFFSETS)
-    ends = {Node(height - 1, width - 1, False), Node(height - 1, width - 1, True)}
-    cost_1 = find_path(
-        graph=graph, start=Node(0, 0, False), ends=ends, height=height, width=width
-    )
-    cost_2 = find_path(
-        graph=graph, start=Node(0, 0, True), ends=ends, height=height, width=width
-    )
-    return str(min(cost_1, cost_2))
+    tables = build_cost_tables(board, get_offsets(min_move, max_move))
+    starts, ends = get_starts_and_ends(height, width)
+    return str(find_path(tables=tables, starts=starts, ends=ends))
 
 
 if __name__ == "__main__":
@@ -1,31 +1,30 @@
 import logging
 from pathlib import Path
 
+import click
+
 from ..cli_utils import wrap_main
 from ..io_utils import parse_board
 from ..logs import setup_logging
-from .task_1 import Node, build_graph, find_path
+from .task_1 import build_cost_tables, find_path, get_offsets, get_starts_and_ends
 
 logger = logging.getLogger(__name__)
 
 
-OFFSETS = [-10, -9, -8, -7, -6, -5, -4, 4, 5, 6, 7, 8, 9, 10]
+MIN_MOVE = 4
+MAX_MOVE = 10
 
 
 @wrap_main
-def main(filename: Path) -> str:
+@click.option("--min-move", default=MIN_MOVE, show_default=True)
+@click.option("--max-move", default=MAX_MOVE, show_default=True)
+def main(filename: Path, min_move: int, max_move: int) -> str:
     board = parse_board(filename, {c: int(c) for c in "123456789"})
     height, width = board.shape
     logger.debug("Board:\n%s", board)
-    graph = build_graph(board, OFFSETS)
-    ends = {Node(height - 1, width - 1, False), Node(height - 1, width - 1, True)}
-    cost_1 = find_path(
-        graph=graph, start=Node(0, 0, False), ends=ends, height=height, width=width
-    )
-    cost_2 = find_path(
-        graph=graph, start=Node(0, 0, True), ends=ends, height=height, width=width
-    )
-    return str(min(cost_1, cost_2))
+    tables = build_cost_tables(board, get_offsets(min_move, max_move))
+    starts, ends = get_starts_and_ends(height, width)
+    return str(find_path(tables=tables, starts=starts, ends=ends))
 
 
 if __name__ == "__main__":
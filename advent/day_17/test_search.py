@@ -0,0 +1,54 @@
+import itertools as it
+from pathlib import Path
+from typing import Optional, cast
+
+import click
+import numpy as np
+from click.testing import CliRunner
+
+from .search import find_path_astar, find_path_bidirectional, main
+from .task_1 import build_cost_tables, get_offsets
+
+
+def test_search_modes_agree() -> None:
+    rng = np.random.default_rng(17)
+    board = rng.integers(2, 10, size=(7, 9), dtype=np.uint8)
+    cells = [(0, 0), (6, 8), (3, 4), (6, 0), (2, 7)]
+    for min_move, max_move in [(1, 3), (4, 10), (2, 5)]:
+        tables = build_cost_tables(board, get_offsets(min_move, max_move))
+        for start, end in it.product(cells, repeat=2):
+            results: set[Optional[int]] = set()
+            for find_path, min_cost in it.product(
+                [find_path_astar, find_path_bidirectional], [0, 2]
+            ):
+                try:
+                    cost, _ = find_path(tables, start, end, min_cost=min_cost)
+                except ValueError:
+                    results.add(None)
+                else:
+                    results.add(cost)
+            assert len(results) == 1, (min_move, max_move, start, end, results)
+
+
+def test_query_outside_board(tmp_path: Path) -> None:
+    filename = tmp_path / "board.txt"
+    filename.write_text("1234\n5678\n9123\n")
+    command = cast(click.Command, main)
+    runner = CliRunner()
+    for query in ["0 0 0 4", "-1 0 2 3", "0 0 3 0"]:
+        result = runner.invoke(command, [str(filename), "--query", *query.split()])
+        assert result.exit_code == 2, result.output
+        assert "outside the 3x4 board" in result.output
+    result = runner.invoke(command, [str(filename), "--query", "0", "0", "2", "3"])
+    assert result.exit_code == 0, result.output
+
+
+def test_bidirectional_expands_fewer_states() -> None:
+    rng = np.random.default_rng(17)
+    board = rng.integers(1, 10, size=(60, 60), dtype=np.uint8)
+    tables = build_cost_tables(board, get_offsets(1, 3))
+    for min_cost in [0, 1]:
+        one_way = find_path_astar(tables, (0, 0), (59, 59), min_cost=min_cost)
+        both_ways = find_path_bidirectional(tables, (0, 0), (59, 59), min_cost=min_cost)
+        assert both_ways.cost == one_way.cost
+        assert both_ways.expanded < one_way.expanded
@@ -5,10 +5,6 @@ from enum import Enum
 from pathlib import Path
 from typing import Iterable, NamedTuple
 
-import cv2
-import numpy as np
-from numpy import typing as npt
-
 from ..cli_utils import wrap_main
 from ..io_utils import get_stripped_lines
 from ..logs import setup_logging
@@ -53,39 +49,28 @@ DIRECTION_TO_SHIFT = {
 }
 
 
-def make_board(instructions: Iterable[Instruction]) -> npt.NDArray[np.uint8]:
-    current = Point(0, 0)
-    indices = [current]
-    for instruction in instructions:
-        shift = DIRECTION_TO_SHIFT[instruction.direction]
-        for _ in range(instruction.distance):
-            current = current.add(shift)
-            indices.append(current)
-    indices_array = np.array(indices)
-    min_y = indices_array[:, 0].min()
-    max_y = indices_array[:, 0].max()
-    min_x = indices_array[:, 1].min()
-    max_x = indices_array[:, 1].max()
-    y_range = max_y - min_y + 1
-    x_range = max_x - min_x + 1
-    board = np.zeros((1 + y_range + 1, 1 + x_range + 1), dtype=np.uint8)
-    for y, x in indices_array:
-        board[y - min_y + 1, x - min_x + 1] = 1
-    return board
-
-
-def fill_board(board: npt.NDArray[np.uint8]) -> None:
-    cv2.floodFill(board, None, (0, 0), 2)
+def get_volume(instructions: Iterable[Instruction]) -> int:
+    # Shoelace formula over the trench corners gives the area inside the
+    # centre line of the trench, Pick's theorem turns that into the number of
+    # interior blocks, and the trench itself adds one block per unit step.
+    y = x = 0
+    twice_area = 0
+    perimeter = 0
+    for direction, distance, _ in instructions:
+        shift = DIRECTION_TO_SHIFT[direction]
+        next_y = y + shift.y * distance
+        next_x = x + shift.x * distance
+        twice_area += x * next_y - next_x * y
+        perimeter += distance
+        y, x = next_y, next_x
+    return (abs(twice_area) + perimeter) // 2 + 1
 
 
 @wrap_main
 def main(filename: Path) -> str:
     lines = get_stripped_lines(filename)
     instructions = map(parse_instruction, lines)
-    board = make_board(instructions)
-    fill_board(board)
-    volume = np.count_nonzero((board == 1) | (board == 0))
-    return str(volume)
+    return str(get_volume(instructions))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,11 @@
+from .task_1 import Direction, Instruction, get_volume
+
+
+def test_get_volume_is_exact_for_large_coordinates() -> None:
+    side = 2**60 + 1
+    square = [
+        Instruction(direction, side, "")
+        for direction in (Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP)
+    ]
+    assert get_volume(square) == (side + 1) ** 2
+    assert get_volume(reversed(square)) == (side + 1) ** 2
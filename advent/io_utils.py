@@ -1,3 +1,5 @@
+import struct
+import zlib
 from pathlib import Path
 from typing import Iterable
 
@@ -21,3 +23,47 @@ def parse_board(filename: Path, char_mapping: dict[str, int]) -> npt.NDArray[np.
         [[char_mapping[c] for c in line] for line in get_stripped_lines(filename)],
         dtype=np.uint8,
     )
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    header = struct.pack(">I", len(data)) + kind
+    return header + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def write_grayscale_image(filename: Path, image: npt.NDArray[np.uint8]) -> None:
+    """Write an 8-bit grayscale image as PNG, or as PGM for a .pgm suffix."""
+    height, width = image.shape
+    write_grayscale_rows(filename, width, height, [image])
+
+
+def write_grayscale_rows(
+    filename: Path,
+    width: int,
+    height: int,
+    blocks: Iterable[npt.NDArray[np.uint8]],
+) -> None:
+    """Like write_grayscale_image, for an image given as consecutive row blocks."""
+    rows_written = 0
+    with filename.open("wb") as f:
+        if filename.suffix.lower() == ".pgm":
+            f.write(f"P5\n{width} {height}\n255\n".encode("ascii"))
+            for block in blocks:
+                f.write(np.ascontiguousarray(block).tobytes())
+                rows_written += len(block)
+        else:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+            f.write(_png_chunk(b"IHDR", header))
+            # one compressed stream, emitted as an IDAT chunk per block
+            compressor = zlib.compressobj()
+            for block in blocks:
+                # every scanline starts with filter type 0 (none)
+                scanlines = np.zeros((len(block), width + 1), dtype=np.uint8)
+                scanlines[:, 1:] = block
+                rows_written += len(block)
+                if data := compressor.compress(scanlines.tobytes()):
+                    f.write(_png_chunk(b"IDAT", data))
+            f.write(_png_chunk(b"IDAT", compressor.flush()))
+            f.write(_png_chunk(b"IEND", b""))
+    if rows_written != height:
+        raise ValueError(f"Expected {height} rows, got {rows_written}")